@@ -0,0 +1,279 @@
+"""API HTTP/JSON des fiches MEDDIC pour les intégrations (BI, synchronisation CRM)
+
+Application ASGI (Starlette) indépendante de l'interface Streamlit, qui
+s'appuie sur la même classe MEDDICDatabase. Les appels à la base, bloquants,
+sont exécutés dans le pool de threads pour ne pas bloquer la boucle asynchrone.
+
+Les lectures renvoient un ETag : une fiche est identifiée par l'empreinte de son
+contenu, une liste ou les statistiques par la version des données. Un client qui renvoie
+cet ETag dans If-None-Match reçoit une réponse 304 vide tant que rien n'a changé.
+
+Lancement :
+    python api.py --port 8000
+    uvicorn api:app --port 8000
+"""
+import argparse
+import hashlib
+import json
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# Import des modules locaux
+from config import *
+from database import MEDDICDatabase, FICHE_FIELDS, FILTER_COLUMNS, PROJECTIONS
+
+class APIError(Exception):
+    """Erreur renvoyée au client avec un code HTTP"""
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+def _records(fiches_df):
+    """Lignes d'un DataFrame en dictionnaires sérialisables (None pour les valeurs manquantes)"""
+    return fiches_df.astype(object).where(fiches_df.notna(), None).to_dict('records')
+
+def _make_etag(*parts):
+    """ETag fort calculé à partir des éléments qui déterminent la réponse"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest[:20]}"'
+
+def _fiche_etag(fiche):
+    # Empreinte de la ligne entière : updated_at, à la seconde près, ne distingue
+    # pas deux écritures rapprochées
+    return _make_etag("fiche", json.dumps(fiche, sort_keys=True, ensure_ascii=False, default=str))
+
+def _etag_matches(header, etag, weak=True):
+    """
+    Indique si un en-tête If-None-Match / If-Match désigne l'ETag courant
+
+    Args:
+        header (str): Valeur de l'en-tête
+        etag (str): ETag fort de la version courante
+        weak (bool): Comparaison faible (If-None-Match) ; If-Match exige une
+            comparaison forte, qui ne retient aucun ETag W/ (RFC 9110)
+    """
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in header.split(',')]
+    return etag in tags or (weak and f"W/{etag}" in tags)
+
+def _conditional_json(request, content, etag, status_code=200):
+    """Réponse JSON avec ETag, ou 304 si le client possède déjà cette version"""
+    headers = {"ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content, status_code=status_code, headers=headers)
+
+def _int_param(request, name, default, minimum=1, maximum=None):
+    """Paramètre entier de la query string, borné"""
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise APIError(400, f"Paramètre '{name}' invalide: entier attendu")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise APIError(400, f"Paramètre '{name}' hors limites")
+    return value
+
+async def _json_body(request):
+    """
+    Corps JSON de la requête, limité aux champs modifiables d'une fiche
+
+    Les colonnes calculées par le serveur (id, priorité, complétude, dates), présentes
+    dans les réponses GET, sont ignorées : une fiche lue peut être renvoyée telle quelle.
+    """
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise APIError(400, "Corps JSON invalide")
+    if not isinstance(payload, dict):
+        raise APIError(400, "Un objet JSON est attendu")
+
+    unknown = sorted(set(payload) - set(request.app.state.db.columns))
+    if unknown:
+        raise APIError(422, f"Champs inconnus: {', '.join(unknown)}")
+    return {field: payload[field] for field in FICHE_FIELDS if field in payload}
+
+async def _get_existing_fiche(db, request):
+    try:
+        fiche_id = int(request.path_params['fiche_id'])
+    except ValueError:
+        raise APIError(404, "Fiche introuvable")
+    fiche = await run_in_threadpool(db.get_fiche_by_id, fiche_id)
+    if fiche is None:
+        raise APIError(404, "Fiche introuvable")
+    return fiche
+
+async def _save(db, fiche_data, precondition=None):
+    """Enregistre une fiche et renvoie sa version relue en base"""
+    try:
+        fiche_id = await run_in_threadpool(db.save_fiche, fiche_data, precondition)
+    except ValueError as e:
+        raise APIError(422, str(e))
+    return await run_in_threadpool(db.get_fiche_by_id, fiche_id)
+
+async def list_fiches(request):
+    """GET /fiches : liste filtrée, triée et paginée"""
+    db = request.app.state.db
+    params = request.query_params
+
+    filters = {column: params[column] for column in FILTER_COLUMNS if params.get(column)}
+    sort_by = params.get("sort_by", "updated_at")
+    descending = params.get("order", "desc").lower() != "asc"
+    page = _int_param(request, "page", 1)
+    page_size = _int_param(request, "page_size", UI_CONFIG["fiches_per_page"],
+                           maximum=API_CONFIG["max_page_size"])
+    columns = params.get("columns", "full")
+    if columns not in PROJECTIONS:
+        raise APIError(400, f"Projection inconnue: {columns} ({', '.join(PROJECTIONS)})")
+
+    # La version des données suffit à savoir si la page a changé : 304 sans requête
+    data_version = await run_in_threadpool(db.get_data_version)
+    etag = _make_etag("list", data_version, sorted(params.multi_items()))
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    try:
+        fiches_df, total = await run_in_threadpool(
+            db.query_fiches, filters, sort_by=sort_by, descending=descending,
+            page=page, page_size=page_size, columns=columns
+        )
+    except ValueError as e:
+        raise APIError(400, str(e))
+
+    content = {"items": _records(fiches_df), "total": total, "page": page, "page_size": page_size}
+    return JSONResponse(content, headers={"ETag": etag})
+
+async def get_fiche(request):
+    """GET /fiches/{id}"""
+    fiche = await _get_existing_fiche(request.app.state.db, request)
+    return _conditional_json(request, fiche, _fiche_etag(fiche))
+
+async def create_fiche(request):
+    """POST /fiches : création (client_name et company obligatoires)"""
+    db = request.app.state.db
+    fiche_data = {field: None for field in FICHE_FIELDS}
+    fiche_data.update(await _json_body(request))
+    if not fiche_data['status']:
+        fiche_data['status'] = MEDDIC_STATUS[0]
+
+    fiche = await _save(db, fiche_data)
+    headers = {"ETag": _fiche_etag(fiche), "Location": f"/fiches/{fiche['id']}"}
+    return JSONResponse(fiche, status_code=201, headers=headers)
+
+async def update_fiche(request):
+    """PUT /fiches/{id} : mise à jour des champs fournis, les autres sont conservés
+
+    Avec If-Match, la mise à jour est refusée (412) si la fiche a changé entre-temps.
+    """
+    db = request.app.state.db
+    fiche = await _get_existing_fiche(db, request)
+
+    precondition = None
+    if_match = request.headers.get("if-match")
+    if if_match:
+        # Vérifiée sur la ligne relue dans la transaction de la mise à jour :
+        # aucune écriture concurrente ne peut s'intercaler entre les deux
+        def precondition(current):
+            if not current or not _etag_matches(if_match, _fiche_etag(current), weak=False):
+                raise APIError(412, "La fiche a été modifiée depuis la dernière lecture")
+        precondition(fiche)
+
+    fiche_data = {field: fiche[field] for field in FICHE_FIELDS}
+    fiche_data.update(await _json_body(request))
+    fiche_data['id'] = fiche['id']
+
+    fiche = await _save(db, fiche_data, precondition)
+    return JSONResponse(fiche, headers={"ETag": _fiche_etag(fiche)})
+
+async def delete_fiche(request):
+    """DELETE /fiches/{id}"""
+    db = request.app.state.db
+    fiche = await _get_existing_fiche(db, request)
+    await run_in_threadpool(db.delete_fiche, fiche['id'])
+    return Response(status_code=204)
+
+async def search(request):
+    """GET /search?q=... : recherche plein texte, résultats classés par pertinence"""
+    db = request.app.state.db
+    term = request.query_params.get("q", "")
+    limit = _int_param(request, "limit", UI_CONFIG["search_results_limit"],
+                       maximum=API_CONFIG["max_page_size"])
+
+    data_version = await run_in_threadpool(db.get_data_version)
+    etag = _make_etag("search", data_version, term, limit)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    fiches_df = await run_in_threadpool(db.search_fiches, term, limit)
+    return JSONResponse({"items": _records(fiches_df), "total": len(fiches_df)}, headers={"ETag": etag})
+
+async def statistics(request):
+    """GET /statistics : statistiques globales (mêmes clés que la sidebar)"""
+    db = request.app.state.db
+    data_version = await run_in_threadpool(db.get_data_version)
+    etag = _make_etag("statistics", data_version)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    stats = await run_in_threadpool(db.get_statistics)
+    return JSONResponse(stats, headers={"ETag": etag})
+
+async def handle_api_error(request, exc):
+    return JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+
+def create_app(db_path=DATABASE_CONFIG["db_name"]):
+    """
+    Construit l'application ASGI
+
+    La base est ouverte au démarrage du serveur et fermée à son arrêt (ce qui
+    vide la file d'écriture de l'audit trail).
+
+    Args:
+        db_path (str): Chemin de la base SQLite
+
+    Returns:
+        Starlette: Application ASGI
+    """
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.db = MEDDICDatabase(db_path)
+        try:
+            yield
+        finally:
+            app.state.db.close()
+
+    routes = [
+        Route("/fiches", list_fiches, methods=["GET"]),
+        Route("/fiches", create_fiche, methods=["POST"]),
+        Route("/fiches/{fiche_id}", get_fiche, methods=["GET"]),
+        Route("/fiches/{fiche_id}", update_fiche, methods=["PUT"]),
+        Route("/fiches/{fiche_id}", delete_fiche, methods=["DELETE"]),
+        Route("/search", search, methods=["GET"]),
+        Route("/statistics", statistics, methods=["GET"]),
+    ]
+    return Starlette(routes=routes, lifespan=lifespan, exception_handlers={APIError: handle_api_error})
+
+app = create_app()
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP des fiches MEDDIC")
+    parser.add_argument("--db", default=DATABASE_CONFIG["db_name"], help="Chemin de la base SQLite")
+    parser.add_argument("--host", default=API_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=API_CONFIG["port"])
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args.db), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime, timezone
+
+# Import des modules locaux
+from config import *
+
+logger = logging.getLogger(__name__)
+
+# Écrivains ouverts, vidés à la sortie du processus (une seule inscription atexit)
+_open_writers = weakref.WeakSet()
+
+@atexit.register
+def _close_open_writers():
+    for writer in list(_open_writers):
+        writer.close()
+
+# Champs dont les modifications sont tracées individuellement
+AUDITED_FIELDS = [
+    'client_name', 'company', 'meeting_date', 'commercial',
+    'metrics', 'economic_buyer', 'decision_criteria', 'decision_process',
+    'identify_pain', 'champion', 'status', 'notes', 'priority'
+]
+
+def _normalize(value):
+    """Représentation textuelle comparable d'une valeur (None et vide sont équivalents)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value)
+
+def _timestamp():
+    """Horodatage au format de CURRENT_TIMESTAMP (UTC)"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+def diff_fiche(old_data, new_data, fields=AUDITED_FIELDS):
+    """
+    Compare deux versions d'une fiche champ par champ
+
+    Args:
+        old_data (dict): Valeurs avant modification
+        new_data (dict): Valeurs après modification
+        fields (list): Champs à comparer
+
+    Returns:
+        list: Tuples (champ, ancienne valeur, nouvelle valeur) des seuls champs modifiés
+    """
+    changes = []
+    for field in fields:
+        if field not in new_data:
+            continue
+        old_value = _normalize(old_data.get(field))
+        new_value = _normalize(new_data.get(field))
+        if old_value != new_value:
+            changes.append((field, old_value, new_value))
+    return changes
+
+class AuditWriter:
+    """Écriture asynchrone et par lots de l'audit trail
+
+    Les entrées sont placées dans une file bornée puis insérées par un thread
+    dédié, en transactions groupées (executemany), hors de la transaction de
+    sauvegarde de l'utilisateur. Si la file est pleine, l'écriture devient
+    synchrone plutôt que de perdre des entrées. Un lot dont l'écriture échoue
+    est réessayé séparément des nouvelles entrées, au plus `max_attempts` fois ;
+    au-delà, ou si les lots en échec dépassent la taille de la file, il est
+    écrit dans le fichier des entrées non écrites (dead letter) et journalisé.
+    """
+
+    def __init__(self, pool, max_queue_size=SECURITY_CONFIG["audit_queue_size"],
+                 batch_size=SECURITY_CONFIG["audit_batch_size"],
+                 flush_interval=SECURITY_CONFIG["audit_flush_interval"],
+                 max_attempts=SECURITY_CONFIG["audit_max_attempts"],
+                 dead_letter_path=SECURITY_CONFIG["audit_dead_letter_path"]):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.max_failed_entries = max_queue_size
+        self.dead_letter_path = dead_letter_path
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        # Lots en échec : (entrées, tentatives), les plus anciens d'abord
+        self._failed = deque()
+        self._failed_entries = 0
+        self._failed_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="meddic-audit-writer", daemon=True)
+        self._thread.start()
+        _open_writers.add(self)
+
+    def record(self, fiche_id, action, changes=None):
+        """
+        Ajoute des entrées d'audit à la file d'écriture
+
+        Appelé après la validation de la fiche : une erreur d'écriture de l'audit
+        est journalisée, jamais relevée (la fiche est bien enregistrée).
+
+        Args:
+            fiche_id (int): Identifiant de la fiche
+            action (str): CREATE, UPDATE ou DELETE
+            changes (list): Tuples (champ, ancienne valeur, nouvelle valeur) ;
+                sans changements, une seule entrée sans détail de champ est créée
+        """
+        timestamp = _timestamp()
+        if changes:
+            entries = [(fiche_id, action, field, old, new, timestamp) for field, old, new in changes]
+        else:
+            entries = [(fiche_id, action, None, None, None, timestamp)]
+
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                # File saturée : on vide la file de façon synchrone
+                self._write_or_keep([entry] + self._drain())
+
+    def _drain(self, limit=None):
+        """Retire de la file les entrées disponibles sans attendre"""
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """Insère un lot d'entrées dans une seule transaction"""
+        if not batch:
+            return
+        with self.pool.transaction() as conn:
+            conn.executemany("""
+                INSERT INTO audit_log (fiche_id, action, field_changed, old_value, new_value, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, batch)
+
+    def _dead_letter(self, batch, reason):
+        """Met de côté des entrées abandonnées, dans un fichier JSON Lines"""
+        logger.error("%d entrée(s) d'audit abandonnée(s) (%s), écrites dans %s",
+                     len(batch), reason, self.dead_letter_path)
+        try:
+            with open(self.dead_letter_path, 'a', encoding='utf-8') as output:
+                for entry in batch:
+                    output.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            logger.exception("Impossible d'écrire les entrées d'audit abandonnées")
+
+    def _keep_failed(self, batch, attempts):
+        """Conserve un lot en échec pour une nouvelle tentative, dans la limite fixée"""
+        if attempts >= self.max_attempts:
+            self._dead_letter(batch, f"{attempts} tentatives")
+            return
+        overflow = []
+        with self._failed_lock:
+            self._failed.append((batch, attempts))
+            self._failed_entries += len(batch)
+            while self._failed_entries > self.max_failed_entries:
+                oldest, _ = self._failed.popleft()
+                self._failed_entries -= len(oldest)
+                overflow.extend(oldest)
+        if overflow:
+            self._dead_letter(overflow, "trop d'entrées en échec")
+
+    def _write_or_keep(self, batch):
+        """Écrit un lot ; en cas d'échec, le journalise et le conserve pour une nouvelle tentative"""
+        try:
+            self._write(batch)
+            return True
+        except Exception:
+            logger.exception("Échec d'écriture de %d entrée(s) d'audit, nouvelle tentative", len(batch))
+            self._keep_failed(batch, 1)
+            return False
+
+    def _retry_failed(self):
+        """Réessaie chaque lot en échec séparément ; retourne False si l'un échoue encore"""
+        with self._failed_lock:
+            failed = list(self._failed)
+            self._failed.clear()
+            self._failed_entries = 0
+        success = True
+        for batch, attempts in failed:
+            try:
+                self._write(batch)
+            except Exception:
+                logger.warning("Nouvel échec d'écriture de %d entrée(s) d'audit (tentative %d)",
+                               len(batch), attempts + 1)
+                self._keep_failed(batch, attempts + 1)
+                success = False
+        return success
+
+    def _run(self):
+        """Boucle du thread d'écriture : attend une entrée puis écrit le lot disponible"""
+        next_retry = 0
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            batch += self._drain(max(self.batch_size - len(batch), 0))
+            written = self._write_or_keep(batch) if batch else True
+
+            # Lots en échec : au plus une tentative par intervalle, sans bloquer les nouvelles entrées
+            if self._failed and time.monotonic() >= next_retry:
+                written = self._retry_failed() and written
+                next_retry = time.monotonic() + self.flush_interval
+            if not written:
+                self._stop.wait(self.flush_interval)
+
+    def flush(self):
+        """Écrit immédiatement toutes les entrées en attente (les échecs restent à réessayer)"""
+        self._retry_failed()
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                break
+            self._write_or_keep(batch)
+
+    def close(self):
+        """Arrête le thread d'écriture après avoir vidé la file"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        _open_writers.discard(self)
+        self.flush()
+        # Dernière chance passée : les lots encore en échec ne seraient jamais réécrits
+        with self._failed_lock:
+            failed = [entry for batch, _ in self._failed for entry in batch]
+            self._failed.clear()
+            self._failed_entries = 0
+        if failed:
+            self._dead_letter(failed, "arrêt de l'application")
@@ -0,0 +1,229 @@
+"""Sauvegardes en ligne de la base MEDDIC
+
+Les sauvegardes utilisent l'API de backup de SQLite : la copie est cohérente
+même si l'application écrit pendant l'opération, et elle est réalisée par
+paquets de pages pour ne pas bloquer les autres connexions.
+
+Utilisation en ligne de commande :
+    python backup.py                 # sauvegarde immédiate puis purge
+    python backup.py --scheduled     # sauvegarde seulement si elle est due
+    python backup.py --daemon        # planificateur en continu
+"""
+import argparse
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+# Import des modules locaux
+from config import *
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = "meddic_backup_"
+
+# Intervalle entre deux sauvegardes selon DATABASE_CONFIG["backup_frequency"]
+BACKUP_FREQUENCIES = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1)
+}
+
+def _new_backup_path(backup_dir):
+    """Chemin (sans extension .gz) d'une nouvelle sauvegarde, jamais celui d'une sauvegarde existante"""
+    # Microsecondes : deux sauvegardes dans la même seconde ne s'écrasent pas
+    base_path = os.path.join(backup_dir, f"{BACKUP_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+    backup_path = f"{base_path}.db"
+    suffix = 1
+    while any(os.path.exists(path) for path in (backup_path, backup_path + ".gz", backup_path + ".tmp")):
+        backup_path = f"{base_path}_{suffix}.db"
+        suffix += 1
+    return backup_path
+
+def backup_database(db_path, backup_dir=DATABASE_CONFIG["backup_dir"],
+                    compress=DATABASE_CONFIG["backup_compress"],
+                    pages=DATABASE_CONFIG["backup_pages_per_step"],
+                    sleep=DATABASE_CONFIG["backup_step_sleep"]):
+    """
+    Crée une sauvegarde cohérente de la base, sans interrompre l'application
+
+    Args:
+        db_path (str): Chemin vers la base de données
+        backup_dir (str): Répertoire de sauvegarde
+        compress (bool): Compresse la sauvegarde au format gzip
+        pages (int): Nombre de pages copiées à chaque étape
+        sleep (float): Pause entre deux étapes (secondes), laissant passer les écritures
+
+    Returns:
+        str: Chemin vers le fichier de sauvegarde
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+
+    backup_path = _new_backup_path(backup_dir)
+    temp_path = backup_path + ".tmp"
+
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(temp_path)
+    try:
+        source.backup(target, pages=pages, sleep=sleep)
+    except Exception:
+        target.close()
+        os.remove(temp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+
+    if compress:
+        backup_path += ".gz"
+        with open(temp_path, 'rb') as raw, gzip.open(backup_path, 'wb') as compressed:
+            shutil.copyfileobj(raw, compressed)
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, backup_path)
+
+    return backup_path
+
+def list_backups(backup_dir=DATABASE_CONFIG["backup_dir"]):
+    """
+    Liste les sauvegardes existantes
+
+    Args:
+        backup_dir (str): Répertoire de sauvegarde
+
+    Returns:
+        list: Chemins des sauvegardes, de la plus ancienne à la plus récente
+    """
+    if not os.path.isdir(backup_dir):
+        return []
+
+    backups = [
+        os.path.join(backup_dir, name)
+        for name in os.listdir(backup_dir)
+        if name.startswith(BACKUP_PREFIX) and (name.endswith(".db") or name.endswith(".db.gz"))
+    ]
+    return sorted(backups, key=os.path.getmtime)
+
+def prune_backups(backup_dir=DATABASE_CONFIG["backup_dir"],
+                  retention_days=SECURITY_CONFIG["backup_retention_days"]):
+    """
+    Supprime les sauvegardes plus anciennes que la durée de rétention
+
+    La sauvegarde la plus récente est toujours conservée.
+
+    Args:
+        backup_dir (str): Répertoire de sauvegarde
+        retention_days (int): Durée de conservation en jours
+
+    Returns:
+        list: Chemins des sauvegardes supprimées
+    """
+    limit = datetime.now() - timedelta(days=retention_days)
+    removed = []
+    for path in list_backups(backup_dir)[:-1]:
+        if datetime.fromtimestamp(os.path.getmtime(path)) < limit:
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+def is_backup_due(backup_dir=DATABASE_CONFIG["backup_dir"],
+                  frequency=DATABASE_CONFIG["backup_frequency"]):
+    """
+    Indique si une sauvegarde doit être faite selon la fréquence configurée
+
+    Args:
+        backup_dir (str): Répertoire de sauvegarde
+        frequency (str): hourly, daily ou weekly
+
+    Returns:
+        bool: True si aucune sauvegarde récente n'existe
+    """
+    if frequency not in BACKUP_FREQUENCIES:
+        raise ValueError(f"Fréquence de sauvegarde inconnue: {frequency}")
+
+    backups = list_backups(backup_dir)
+    if not backups:
+        return True
+    last_backup = datetime.fromtimestamp(os.path.getmtime(backups[-1]))
+    return datetime.now() - last_backup >= BACKUP_FREQUENCIES[frequency]
+
+def run_scheduled_backup(db_path, backup_dir=DATABASE_CONFIG["backup_dir"]):
+    """
+    Sauvegarde la base si elle est due, puis applique la rétention
+
+    Args:
+        db_path (str): Chemin vers la base de données
+        backup_dir (str): Répertoire de sauvegarde
+
+    Returns:
+        str: Chemin de la sauvegarde créée, ou None si aucune n'était due
+    """
+    if not DATABASE_CONFIG["backup_enabled"] or not is_backup_due(backup_dir):
+        return None
+
+    backup_path = backup_database(db_path, backup_dir)
+    prune_backups(backup_dir)
+    return backup_path
+
+class BackupScheduler:
+    """Planificateur de sauvegardes en arrière-plan"""
+
+    def __init__(self, db_path, backup_dir=DATABASE_CONFIG["backup_dir"],
+                 check_interval=DATABASE_CONFIG["backup_check_interval"]):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.check_interval = check_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self):
+        """Vérifie périodiquement si une sauvegarde est due jusqu'à l'arrêt"""
+        while not self._stop.is_set():
+            # Une erreur (disque plein, base verrouillée...) ne doit pas arrêter le planificateur
+            try:
+                backup_path = run_scheduled_backup(self.db_path, self.backup_dir)
+                if backup_path:
+                    logger.info("Sauvegarde créée: %s", backup_path)
+            except Exception:
+                logger.exception("Échec de la sauvegarde planifiée, nouvelle tentative dans %s s",
+                                 self.check_interval)
+            self._stop.wait(self.check_interval)
+
+    def start(self):
+        """Démarre le planificateur dans un thread démon"""
+        self._thread = threading.Thread(target=self.run, name="meddic-backup-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le planificateur"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+def main():
+    parser = argparse.ArgumentParser(description="Sauvegarde de la base MEDDIC")
+    parser.add_argument("--db", default=DATABASE_CONFIG["db_name"], help="Chemin de la base SQLite")
+    parser.add_argument("--dir", default=DATABASE_CONFIG["backup_dir"], help="Répertoire de sauvegarde")
+    parser.add_argument("--compress", action=argparse.BooleanOptionalAction,
+                        default=DATABASE_CONFIG["backup_compress"], help="Compression gzip")
+    parser.add_argument("--scheduled", action="store_true",
+                        help="Ne sauvegarder que si la fréquence configurée l'exige")
+    parser.add_argument("--daemon", action="store_true", help="Planificateur en continu")
+    args = parser.parse_args()
+
+    if args.daemon:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+        BackupScheduler(args.db, args.dir).run()
+    elif args.scheduled:
+        backup_path = run_scheduled_backup(args.db, args.dir)
+        print(f"Sauvegarde créée: {backup_path}" if backup_path else "Aucune sauvegarde due")
+    else:
+        print(f"Sauvegarde créée: {backup_database(args.db, args.dir, compress=args.compress)}")
+        for path in prune_backups(args.dir):
+            print(f"Sauvegarde expirée supprimée: {path}")
+
+if __name__ == "__main__":
+    main()
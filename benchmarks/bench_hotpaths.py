@@ -0,0 +1,157 @@
+"""Benchmark des chemins critiques (base, scoring, recommandations, PDF)
+
+Pour chaque taille demandée, une base SQLite temporaire est remplie par le
+générateur de données synthétiques (même graine, même base), puis chaque
+opération est mesurée plusieurs fois ; la médiane et le minimum sont retenus.
+
+Les résultats sont enregistrés en JSON avec le commit courant : en comparant
+deux fichiers (--compare), les régressions d'un commit à l'autre apparaissent.
+
+Utilisation :
+    python benchmarks/bench_hotpaths.py
+    python benchmarks/bench_hotpaths.py --sizes 1000 10000 --repeat 3
+    python benchmarks/bench_hotpaths.py --compare benchmarks/results/hotpaths_abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+from utils import get_statistics, get_priority_level, get_priority_levels, generate_recommendations
+from database import MEDDICDatabase
+from synthetic_data import SyntheticFicheGenerator, populate_database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# Date de fin fixe : les bases générées sont identiques d'un run à l'autre
+SEED_END_DATE = datetime(2025, 1, 1)
+
+# Fiches rendues en PDF par mesure (le coût ne dépend pas de la taille de la base)
+PDF_SAMPLE = 10
+
+def measure(function, repeat):
+    """Exécute une opération plusieurs fois : (médiane, minimum) en millisecondes"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[0]
+
+def bench_size(size, repeat, seed):
+    """
+    Mesure toutes les opérations sur une base de `size` fiches
+
+    Returns:
+        list: Résultats (case, size, median_ms, min_ms, repeat)
+    """
+    temp_dir = tempfile.mkdtemp(prefix="meddic_bench_")
+    db_path = os.path.join(temp_dir, "bench.db")
+    populate_database(db_path, size, seed=seed, end_date=SEED_END_DATE)
+    db = MEDDICDatabase(db_path)
+    try:
+        fiches_df = db.get_all_fiches()
+        records = fiches_df.to_dict('records')
+        new_fiche = SyntheticFicheGenerator(seed + 1, end_date=SEED_END_DATE).fiche()
+        updated_fiche = dict(records[0])
+
+        # Génération PDF : import local, fpdf n'est chargé que pour ce cas
+        from pdf_generator import MEDDICPDFGenerator
+        generator = MEDDICPDFGenerator()
+        generator.generate_fiche_pdf(records[0])
+
+        cases = {
+            "get_all_fiches": lambda: db.get_all_fiches(include_stats=True),
+            "save_fiche_insert": lambda: db.save_fiche(dict(new_fiche)),
+            "save_fiche_update": lambda: db.save_fiche(dict(updated_fiche)),
+            "search_fiches": lambda: db.search_fiches("budget validation", limit=UI_CONFIG["search_results_limit"]),
+            "get_statistics": lambda: get_statistics(fiches_df),
+            "get_priority_level_rows": lambda: [get_priority_level(fiche) for fiche in records],
+            "get_priority_levels": lambda: get_priority_levels(fiches_df),
+            "generate_recommendations": lambda: [generate_recommendations(fiche) for fiche in records],
+            f"generate_fiche_pdf_x{PDF_SAMPLE}": lambda: [generator.generate_fiche_pdf(fiche) for fiche in records[:PDF_SAMPLE]],
+        }
+
+        results = []
+        for case, function in cases.items():
+            median_ms, min_ms = measure(function, repeat)
+            results.append({
+                "case": case, "size": size, "median_ms": round(median_ms, 3),
+                "min_ms": round(min_ms, 3), "repeat": repeat
+            })
+            print(f"{case:<28}{size:>9}{median_ms:>12.1f}{min_ms:>12.1f}")
+        return results
+    finally:
+        db.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def get_commit():
+    """Commit courant (abrégé), suffixé de -dirty si l'arbre contient des modifications"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+def compare(results, baseline_path):
+    """Affiche l'évolution de la médiane par rapport à un fichier de résultats précédent"""
+    with open(baseline_path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    previous = {(item["case"], item["size"]): item["median_ms"] for item in baseline["results"]}
+
+    print(f"\nComparaison avec {baseline['commit']} :")
+    for item in results:
+        before = previous.get((item["case"], item["size"]))
+        if not before:
+            continue
+        change = (item["median_ms"] - before) / before * 100
+        print(f"{item['case']:<28}{item['size']:>9}{before:>12.1f}{item['median_ms']:>12.1f}{change:>+10.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des chemins critiques MEDDIC")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Nombre de fiches des bases mesurées")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par opération (médiane)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON des résultats (benchmarks/results/ par défaut)")
+    parser.add_argument("--compare", help="Fichier JSON d'un run précédent à comparer")
+    args = parser.parse_args()
+
+    commit = get_commit()
+    print(f"{'Opération':<28}{'Fiches':>9}{'ms médiane':>12}{'ms min':>12}")
+    results = []
+    for size in args.sizes:
+        results.extend(bench_size(size, args.repeat, args.seed))
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"hotpaths_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nRésultats enregistrés dans {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Benchmark du rendu des pages Streamlit (AppTest, sans navigateur)
+
+Chaque page est exécutée avec streamlit.testing.v1.AppTest contre une base
+synthétique, puis les interactions courantes sont rejouées (recherche, filtre,
+changement de page, bouton d'édition). Pour chaque scénario sont relevés le
+temps d'exécution du script, le nombre de requêtes SQL et le pic de mémoire
+Python (tracemalloc, mesuré dans une passe séparée pour ne pas fausser les temps).
+La première exécution, caches vides, est rapportée à part (first_ms, first_queries).
+
+AppTest réexécute toujours le script entier : les interactions limitées à un
+fragment sont donc mesurées comme une exécution complète (borne haute).
+
+Chaque taille de base est mesurée dans un processus distinct, la base étant
+désignée par MEDDIC_DB_PATH ; les sauvegardes automatiques sont désactivées.
+
+Utilisation :
+    python benchmarks/bench_pages.py
+    python benchmarks/bench_pages.py --sizes 1000 --repeat 3
+    python benchmarks/bench_pages.py --compare benchmarks/results/pages_abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_hotpaths import RESULTS_DIR, SEED_END_DATE, get_commit, compare
+
+APP_PATH = os.path.join(ROOT, "app.py")
+
+def _select_company(at):
+    selectbox = next(box for box in at.selectbox if box.label == "Filtrer par entreprise")
+    return selectbox.set_value(selectbox.options[1])
+
+def _search(at):
+    text_input = next(field for field in at.text_input if field.label.startswith("Rechercher"))
+    return text_input.set_value("budget")
+
+def _click(prefix):
+    def click(at):
+        return next(button for button in at.button if button.key and button.key.startswith(prefix)).click()
+    return click
+
+# Scénarios : (nom, page, interaction mesurée après un premier affichage, ou None)
+SCENARIOS = [
+    ("dashboard", "📊 Dashboard", None),
+    ("dashboard_search", "📊 Dashboard", _search),
+    ("all_fiches", "📋 Toutes les Fiches", None),
+    ("all_fiches_filter", "📋 Toutes les Fiches", _select_company),
+    ("all_fiches_page", "📋 Toutes les Fiches", lambda at: at.number_input(key="fiches_page").set_value(2)),
+    ("all_fiches_edit", "📋 Toutes les Fiches", _click("edit_")),
+    ("analytics", "📈 Analytiques", None),
+    ("recommendations", "🎯 Recommandations", None),
+    ("recommendations_edit", "🎯 Recommandations", _click("urgent_")),
+]
+
+class QueryCounter:
+    """Compte les requêtes exécutées sur les connexions du pool"""
+
+    def __init__(self):
+        self.count = 0
+
+    def attach(self, conn):
+        conn.set_trace_callback(self._trace)
+
+    def _trace(self, statement):
+        # Les instructions exécutées par les triggers sont préfixées de "--"
+        if not statement.lstrip().startswith("--"):
+            self.count += 1
+
+def _prepare(page, interaction):
+    """Affiche la page, puis prépare l'interaction : retourne l'AppTest à exécuter"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.session_state['page'] = page
+    if interaction is None:
+        return at
+    at.run()
+    try:
+        interaction(at)
+    except (StopIteration, KeyError, IndexError):
+        return None
+    return at
+
+def _run(at, counter):
+    """Exécute le script : (durée en ms, nombre de requêtes)"""
+    counter.count = 0
+    start = time.perf_counter()
+    at.run()
+    duration = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return duration, counter.count
+
+def run_worker(repeat):
+    """
+    Mesure tous les scénarios sur la base désignée par MEDDIC_DB_PATH
+
+    Returns:
+        list: Résultats (case, median_ms, first_ms, first_queries, queries, peak_kb, repeat)
+    """
+    from config import DATABASE_CONFIG
+    DATABASE_CONFIG["backup_enabled"] = False
+
+    import database
+    counter = QueryCounter()
+    database.CONNECTION_HOOKS.append(counter.attach)
+
+    results = []
+    for case, page, interaction in SCENARIOS:
+        timings = []
+        queries = []
+        for _ in range(repeat):
+            at = _prepare(page, interaction)
+            if at is None:
+                break
+            duration, count = _run(at, counter)
+            timings.append(duration)
+            queries.append(count)
+        if not timings:
+            print(f"{case:<24}{'(interaction indisponible)':>30}", file=sys.stderr)
+            continue
+
+        # Pic mémoire : passe séparée, tracemalloc ralentit l'exécution
+        at = _prepare(page, interaction)
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _run(at, counter)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+
+        first_ms = timings[0]
+        timings.sort()
+        results.append({
+            "case": case, "median_ms": round(timings[len(timings) // 2], 3),
+            "first_ms": round(first_ms, 3), "first_queries": queries[0], "queries": queries[-1],
+            "peak_kb": round(peak / 1024, 1), "repeat": len(timings)
+        })
+    return results
+
+def bench_size(size, repeat, seed):
+    """Génère une base de `size` fiches et mesure les pages dans un processus dédié"""
+    from synthetic_data import populate_database
+
+    temp_dir = tempfile.mkdtemp(prefix="meddic_pages_")
+    try:
+        db_path = os.path.join(temp_dir, "bench.db")
+        populate_database(db_path, size, seed=seed, end_date=SEED_END_DATE)
+
+        # Répertoire de travail temporaire : cache des documents et sauvegardes hors du dépôt
+        env = dict(os.environ, MEDDIC_DB_PATH=db_path)
+        worker = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--repeat", str(repeat)],
+            cwd=temp_dir, env=env, capture_output=True, text=True
+        )
+        if worker.returncode != 0:
+            raise RuntimeError(worker.stderr.strip().splitlines()[-1])
+
+        results = json.loads(worker.stdout.strip().splitlines()[-1])
+        for item in results:
+            item["size"] = size
+            print(f"{item['case']:<24}{size:>9}{item['median_ms']:>12.1f}{item['first_ms']:>12.1f}"
+                  f"{item['first_queries']:>8}/{item['queries']:<4}{item['peak_kb']:>10.0f}")
+        return results
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du rendu des pages Streamlit")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="Nombre de fiches des bases mesurées")
+    parser.add_argument("--repeat", type=int, default=5, help="Exécutions par scénario (médiane)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON des résultats (benchmarks/results/ par défaut)")
+    parser.add_argument("--compare", help="Fichier JSON d'un run précédent à comparer")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.repeat)))
+        return
+
+    commit = get_commit()
+    print(f"{'Scénario':<24}{'Fiches':>9}{'ms médiane':>12}{'ms 1er':>12}{'requêtes':>13}{'pic Ko':>10}")
+    results = []
+    for size in args.sizes:
+        results.extend(bench_size(size, args.repeat, args.seed))
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"pages_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nRésultats enregistrés dans {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
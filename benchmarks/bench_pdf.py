@@ -0,0 +1,84 @@
+"""Micro-benchmark du rendu PDF des fiches MEDDIC
+
+Mesure le temps de rendu d'une fiche aux notes longues, par document et par
+page, avec la police Unicode embarquée puis avec la police de base Helvetica.
+
+Utilisation :
+    python benchmarks/bench_pdf.py
+    python benchmarks/bench_pdf.py --paragraphs 12 --repeat 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+from pdf_generator import MEDDICPDFGenerator
+
+WORDS = (
+    "réduction des coûts processus décision budget validation équipe technique "
+    "intégration délai sécurité conformité économie productivité 20% ROI 150k€ "
+    "direction financière achats comité pilotage migration SAP support 24/7"
+).split()
+
+def make_fiche(paragraphs, words_per_paragraph, seed):
+    """Fiche dont chaque champ MEDDIC contient de longues notes"""
+    rng = random.Random(seed)
+
+    def notes():
+        return '\n'.join(
+            ' '.join(rng.choice(WORDS) for _ in range(words_per_paragraph))
+            for _ in range(paragraphs)
+        )
+
+    fiche = {
+        'id': 1,
+        'company': 'Société Générale d’Équipement',
+        'client_name': 'Hélène Dupré',
+        'commercial': 'François Lefèvre',
+        'meeting_date': '2024-03-15'
+    }
+    fiche.update({field: notes() for field in REQUIRED_MEDDIC_FIELDS})
+    return fiche
+
+def bench(generator, fiche, repeat):
+    """Temps médian de rendu complet d'une fiche (document créé, dessiné et sérialisé)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pdf = generator.new_document()
+        generator.render_fiche(pdf, fiche)
+        pdf.output()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], pdf.pages_count
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du rendu PDF des fiches")
+    parser.add_argument("--paragraphs", type=int, default=6, help="Paragraphes par champ MEDDIC")
+    parser.add_argument("--words", type=int, default=120, help="Mots par paragraphe")
+    parser.add_argument("--repeat", type=int, default=20, help="Rendus mesurés par police")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    fiche = make_fiche(args.paragraphs, args.words, args.seed)
+    generators = [
+        ("Unicode (TTF)", MEDDICPDFGenerator()),
+        ("Helvetica", MEDDICPDFGenerator(font_candidates=[]))
+    ]
+
+    print(f"{'Police':<16}{'Pages':>7}{'ms/document':>14}{'ms/page':>10}")
+    for name, generator in generators:
+        if name.startswith("Unicode") and not generator.font_files:
+            print(f"{name:<16}{'police introuvable':>31}")
+            continue
+        # Premier rendu hors mesure : construction de la police réduite
+        generator.generate_fiche_pdf(fiche)
+        duration, pages = bench(generator, fiche, args.repeat)
+        print(f"{name:<16}{pages:>7}{duration * 1000:>14.1f}{duration * 1000 / pages:>10.1f}")
+
+if __name__ == "__main__":
+    main()
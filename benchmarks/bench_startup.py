@@ -0,0 +1,81 @@
+"""Mesure du coût d'import au démarrage de l'application Streamlit
+
+Chaque scénario est importé dans un interpréteur neuf lancé avec
+`python -X importtime` : le temps cumulé des modules de premier niveau donne
+le coût d'import, et les modules les plus lents sont listés. Le scénario
+« monolithique » reproduit l'ancien app.py qui importait plotly et fpdf
+quelle que soit la page affichée.
+
+Utilisation :
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 5 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules importés par chaque scénario (interface commune + page affichée)
+COMMON_MODULES = ["streamlit", "views.common", "importer"]
+SCENARIOS = {
+    "monolithique": COMMON_MODULES + ["plotly.express", "plotly.graph_objects", "pdf_generator", "output_cache"],
+    "dashboard": COMMON_MODULES + ["views.dashboard"],
+    "nouvelle fiche": COMMON_MODULES + ["views.fiche_form"],
+    "toutes les fiches": COMMON_MODULES + ["views.fiches_list"],
+    "analytiques": COMMON_MODULES + ["views.analytics"],
+    "recommandations": COMMON_MODULES + ["views.recommendations"],
+}
+
+def measure_imports(modules):
+    """
+    Importe des modules dans un nouvel interpréteur et relève -X importtime
+
+    Args:
+        modules (list): Modules à importer
+
+    Returns:
+        tuple: (temps total en ms, liste de (module, temps cumulé en ms))
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    timings = []
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative_ms = int(cumulative) / 1000
+        timings.append((name.strip(), cumulative_ms))
+        # Les modules de premier niveau ne sont pas indentés : leurs temps s'additionnent
+        if not name.startswith("  "):
+            total += cumulative_ms
+    return total, timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût d'import au démarrage, par page")
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par scénario (médiane)")
+    parser.add_argument("--top", type=int, default=10, help="Modules les plus lents affichés")
+    args = parser.parse_args()
+
+    print(f"{'Scénario':<20}{'ms (médiane)':>14}")
+    monolithic_timings = None
+    for name, modules in SCENARIOS.items():
+        runs = sorted((measure_imports(modules) for _ in range(args.repeat)), key=lambda run: run[0])
+        total, timings = runs[len(runs) // 2]
+        print(f"{name:<20}{total:>14.0f}")
+        if monolithic_timings is None:
+            monolithic_timings = timings
+
+    print("\nModules les plus lents (monolithique) :")
+    for module, cumulative_ms in sorted(monolithic_timings, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {module.strip():<40}{cumulative_ms:>8.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
 # Configuration de l'application MEDDIC CRM
+import os
 
 # Paramètres de la base de données
 DATABASE_CONFIG = {
-    "db_name": "meddic_data.db",
+    "db_name": os.environ.get("MEDDIC_DB_PATH", "meddic_data.db"),  # Surchargeable (bases de test, benchmarks)
     "backup_enabled": True,
-    "backup_frequency": "daily"
+    "backup_frequency": "daily",       # hourly, daily ou weekly
+    "backup_dir": "backups",
+    "backup_compress": True,           # Sauvegardes compressées (gzip)
+    "backup_pages_per_step": 256,      # Pages copiées par étape de l'API de backup
+    "backup_step_sleep": 0.01,         # Pause entre deux étapes pour laisser passer les écritures
+    "backup_check_interval": 300,      # Secondes entre deux vérifications du planificateur
+    "pool_size": 5,                 # Connexions SQLite maintenues ouvertes
+    "busy_timeout_ms": 5000,        # Attente maximale sur un verrou d'écriture
+    "journal_mode": "WAL",          # Les lectures ne bloquent plus les écritures
+    "synchronous": "NORMAL",        # Suffisant et sûr en mode WAL
+    "cache_size_kb": 16000,         # Cache de pages par connexion
+    "mmap_size": 268435456,         # 256 Mo de lecture mappée en mémoire
+    "query_cache_entries": 32,      # Résultats de lecture conservés entre deux écritures
+    "query_log": os.environ.get("MEDDIC_QUERY_LOG") == "1",  # Statistiques par requête (query_log.py), coût sur chaque instruction
+    "slow_query_ms": 100,           # Seuil du journal des requêtes lentes (avec EXPLAIN QUERY PLAN)
+    "slow_query_history": 50        # Requêtes lentes conservées pour le panneau Performance
 }
 
 # Paramètres de l'interface
 UI_CONFIG = {
     "theme": "light",
     "sidebar_expanded": True,
-    "page_width": "wide"
+    "page_width": "wide",
+    "fiches_per_page": 20,
+    "search_results_limit": 50
 }
 
 # Statuts disponibles
@@ -76,12 +94,53 @@ MEDDIC_TEMPLATES = {
 EXPORT_CONFIG = {
     "pdf_enabled": True,
     "csv_enabled": True,
-    "excel_enabled": True
+    "excel_enabled": True,
+    "output_cache_dir": "cache/outputs",  # PDF et résumés déjà générés, indexés par contenu
+    "output_cache_max_mb": 200,           # Taille maximale du cache (éviction des moins lus)
+    "chunk_size": 1000,     # Lignes lues par paquet lors des exports
+    "pdf_workers": None,    # Processus de rendu des exports PDF (None = nombre de CPU)
+    "pdf_parallel_threshold": 20, # En dessous, les PDF sont rendus sans pool de processus
+    # Polices Unicode des PDF (normale, grasse), la première disponible est utilisée ;
+    # à défaut, repli sur Helvetica (caractères latin-1 uniquement)
+    "pdf_font_candidates": [
+        ("fonts/DejaVuSans.ttf", "fonts/DejaVuSans-Bold.ttf"),
+        ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+        ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arialbd.ttf"),
+        ("/System/Library/Fonts/Supplemental/Arial.ttf", "/System/Library/Fonts/Supplemental/Arial Bold.ttf")
+    ]
+}
+
+# Import en masse
+IMPORT_CONFIG = {
+    "batch_size": 5000,     # Lignes validées et insérées par transaction
+    "max_errors_displayed": 50
+}
+
+# API HTTP (api.py)
+API_CONFIG = {
+    "host": "127.0.0.1",    # Écoute locale uniquement par défaut (pas d'authentification)
+    "port": 8000,
+    "max_page_size": 500
+}
+
+# Mesures de performance (perf.py), activables depuis la sidebar
+PERF_CONFIG = {
+    "enabled": os.environ.get("MEDDIC_PERF") == "1",  # Collecte active au démarrage
+    "history_size": 100,    # Exécutions conservées pour le panneau et les exports
+    "top_spans": 15,        # Spans affichés dans le panneau Performance
+    "top_statements": 10,   # Requêtes SQL (et requêtes lentes) affichées
+    "profile_lines": 40,    # Lignes du rapport cProfile
+    "dump_path": os.environ.get("MEDDIC_PERF_DUMP", "perf_metrics.prom")  # .prom/.txt : Prometheus, sinon JSON
 }
 
 # Paramètres de sécurité
 SECURITY_CONFIG = {
     "backup_retention_days": 30,
     "auto_save_enabled": True,
-    "audit_trail_enabled": True
+    "audit_trail_enabled": True,
+    "audit_queue_size": 10000,      # Entrées d'audit en attente d'écriture (au-delà : écriture synchrone)
+    "audit_batch_size": 500,        # Entrées insérées par transaction
+    "audit_flush_interval": 1.0,    # Secondes d'attente du thread d'écriture
+    "audit_max_attempts": 5,        # Tentatives d'écriture d'un lot avant mise de côté
+    "audit_dead_letter_path": "audit_dead_letter.jsonl"  # Entrées d'audit non écrites (une par ligne)
 }
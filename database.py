@@ -0,0 +1,607 @@
+import sqlite3
+import re
+import threading
+import queue
+from contextlib import contextmanager
+import pandas as pd
+
+# Import des modules locaux
+from config import *
+from utils import *
+from migrations import apply_migrations
+from audit import AuditWriter, diff_fiche
+from perf import instrument_class
+from query_log import TimedConnection
+
+# Champs d'une fiche saisis par l'utilisateur (les autres colonnes sont calculées)
+FICHE_FIELDS = [
+    'client_name', 'company', 'meeting_date', 'commercial',
+    'metrics', 'economic_buyer', 'decision_criteria', 'decision_process',
+    'identify_pain', 'champion', 'status', 'notes'
+]
+
+# Colonnes acceptées pour les filtres et le tri (les noms sont injectés dans le SQL)
+FILTER_COLUMNS = ('status', 'company', 'commercial')
+SORT_COLUMNS = ('updated_at', 'created_at', 'meeting_date', 'company', 'client_name', 'status', 'priority')
+
+# Suite d'un parcours trié par (updated_at DESC, id DESC) : lignes après la dernière lue
+KEYSET_CONDITION = "(updated_at, id) < (?, ?)"
+
+# Fonctions appelées avec chaque nouvelle connexion du pool (instrumentation, benchmarks)
+CONNECTION_HOOKS = []
+
+# Projections nommées : les vues de synthèse ne lisent pas les champs texte volumineux
+PROJECTIONS = {
+    "summary": [
+        'id', 'client_name', 'company', 'meeting_date', 'commercial', 'status',
+        'priority', 'completion_score', 'created_at', 'updated_at'
+    ] + [f"{field}_filled" for field in REQUIRED_MEDDIC_FIELDS],
+    "full": None
+}
+
+class ConnectionPool:
+    """Pool de connexions SQLite thread-safe, partagé entre les sessions Streamlit"""
+    def __init__(self, db_path, pool_size=DATABASE_CONFIG["pool_size"],
+                 busy_timeout_ms=DATABASE_CONFIG["busy_timeout_ms"]):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_connection(self):
+        """Ouvre une nouvelle connexion configurée (WAL, pragmas, busy timeout)"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            isolation_level=None,  # Transactions gérées explicitement
+            factory=TimedConnection if DATABASE_CONFIG["query_log"] else sqlite3.Connection
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA journal_mode = {DATABASE_CONFIG['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous = {DATABASE_CONFIG['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = -{int(DATABASE_CONFIG['cache_size_kb'])}")
+        conn.execute(f"PRAGMA mmap_size = {int(DATABASE_CONFIG['mmap_size'])}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        for hook in CONNECTION_HOOKS:
+            hook(conn)
+        return conn
+
+    def _acquire(self):
+        """Récupère une connexion libre, en crée une ou attend qu'une se libère"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Le pool de connexions est fermé")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.pool_size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self._create_connection()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.busy_timeout_ms / 1000)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Aucune connexion disponible dans le pool")
+
+    def _release(self, conn):
+        """Remet une connexion dans le pool après avoir annulé toute transaction ouverte"""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Fournit une connexion en mode autocommit, adaptée aux lectures"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Fournit une connexion dans une transaction d'écriture (BEGIN IMMEDIATE)"""
+        conn = self._acquire()
+        try:
+            # IMMEDIATE prend le verrou d'écriture dès le début : le busy timeout
+            # s'applique ici plutôt que d'échouer lors de la promotion du verrou
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Ferme toutes les connexions inactives du pool"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+class MEDDICDatabase:
+    def __init__(self, db_path=DATABASE_CONFIG["db_name"]):
+        """Initialise la base de données SQLite pour MEDDIC"""
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
+        self.init_database()
+        self.audit = AuditWriter(self.pool) if SECURITY_CONFIG["audit_trail_enabled"] else None
+        self.fts_enabled = self._table_exists('meddic_fiches_fts')
+        self.columns = self._get_table_columns('meddic_fiches')
+
+    def init_database(self):
+        """Crée ou met à niveau le schéma via les migrations versionnées"""
+        with self.pool.connection() as conn:
+            apply_migrations(conn)
+
+    def _table_exists(self, table_name):
+        """Indique si une table (ou table virtuelle) existe dans la base"""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+            ).fetchone()
+        return row is not None
+
+    def _get_table_columns(self, table_name):
+        """Liste les colonnes d'une table"""
+        with self.pool.connection() as conn:
+            return [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+
+    def _select_list(self, columns):
+        """
+        Construit la liste SELECT d'une projection
+
+        Args:
+            columns (str | list): Nom de projection (voir PROJECTIONS) ou liste de colonnes
+
+        Returns:
+            str: Liste de colonnes SQL ("*" pour la projection complète)
+        """
+        if isinstance(columns, str):
+            if columns not in PROJECTIONS:
+                raise ValueError(f"Projection inconnue: {columns}")
+            columns = PROJECTIONS[columns]
+
+        if columns is None:
+            return "*"
+
+        unknown = [column for column in columns if column not in self.columns]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues: {', '.join(unknown)}")
+        return ', '.join(columns)
+
+    def get_data_version(self):
+        """
+        Retourne la version courante des données
+
+        La version est incrémentée par trigger à chaque écriture sur meddic_fiches,
+        quel que soit le processus qui écrit : deux lectures renvoyant la même
+        version voient exactement les mêmes fiches.
+
+        Returns:
+            int: Version des données
+        """
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+
+    def save_fiche(self, fiche_data, precondition=None):
+        """
+        Sauvegarde une fiche MEDDIC avec audit trail et retourne son identifiant
+
+        Args:
+            fiche_data (dict): Données de la fiche (mise à jour si 'id' est renseigné)
+            precondition (callable): Appelée avec la fiche en base (dict vide si elle
+                n'existe plus) avant la mise à jour, dans la même transaction ; une
+                exception levée annule la sauvegarde et est propagée
+        """
+        # Validation des données
+        is_valid, errors = validate_fiche_data(fiche_data)
+        if not is_valid:
+            raise ValueError(f"Données invalides: {', '.join(errors)}")
+
+        # Calcul de la priorité
+        priority = get_priority_level(fiche_data)
+        fiche_data['priority'] = priority
+
+        # Score de complétude et indicateurs par champ, persistés pour les agrégats SQL
+        completion = get_completion_columns(fiche_data)
+        completion_assignments = ', '.join(f"{column}=?" for column in completion)
+
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            if fiche_data.get('id'):
+                # Récupération des anciennes valeurs pour l'audit
+                cursor.execute("SELECT * FROM meddic_fiches WHERE id=?", (fiche_data['id'],))
+                row = cursor.fetchone()
+                columns = [desc[0] for desc in cursor.description]
+                old_data = dict(zip(columns, row)) if row else {}
+                if precondition is not None:
+                    precondition(old_data)
+
+                # Mise à jour
+                cursor.execute(f"""
+                    UPDATE meddic_fiches
+                    SET client_name=?, company=?, meeting_date=?, commercial=?,
+                        metrics=?, economic_buyer=?, decision_criteria=?,
+                        decision_process=?, identify_pain=?, champion=?,
+                        status=?, notes=?, priority=?, {completion_assignments},
+                        updated_at=CURRENT_TIMESTAMP
+                    WHERE id=?
+                """, (
+                    fiche_data['client_name'], fiche_data['company'],
+                    fiche_data['meeting_date'], fiche_data['commercial'],
+                    fiche_data['metrics'], fiche_data['economic_buyer'],
+                    fiche_data['decision_criteria'], fiche_data['decision_process'],
+                    fiche_data['identify_pain'], fiche_data['champion'],
+                    fiche_data['status'], fiche_data['notes'], priority,
+                    *completion.values(), fiche_data['id']
+                ))
+
+                # Seuls les champs réellement modifiés sont tracés
+                fiche_id = fiche_data['id']
+                action = 'UPDATE'
+                changes = diff_fiche(old_data, fiche_data)
+            else:
+                # Création
+                cursor.execute(f"""
+                    INSERT INTO meddic_fiches
+                    (client_name, company, meeting_date, commercial, metrics,
+                     economic_buyer, decision_criteria, decision_process,
+                     identify_pain, champion, status, notes, priority,
+                     {', '.join(completion)})
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?{', ?' * len(completion)})
+                """, (
+                    fiche_data['client_name'], fiche_data['company'],
+                    fiche_data['meeting_date'], fiche_data['commercial'],
+                    fiche_data['metrics'], fiche_data['economic_buyer'],
+                    fiche_data['decision_criteria'], fiche_data['decision_process'],
+                    fiche_data['identify_pain'], fiche_data['champion'],
+                    fiche_data['status'], fiche_data['notes'], priority,
+                    *completion.values()
+                ))
+
+                fiche_id = cursor.lastrowid
+                action = 'CREATE'
+                changes = None
+
+        # Audit trail écrit en arrière-plan, une fois la sauvegarde validée
+        if self.audit and (action == 'CREATE' or changes):
+            self.audit.record(fiche_id, action, changes)
+
+        return fiche_id
+
+    def insert_fiches(self, fiches_df):
+        """
+        Insère un lot de fiches déjà validées dans une seule transaction
+
+        Les fiches doivent porter leur priorité et leurs colonnes de complétude
+        (voir importer.prepare_batch). L'audit trail du lot est écrit dans la même
+        transaction, par une seule requête INSERT ... SELECT.
+
+        Args:
+            fiches_df (DataFrame): Fiches à insérer, une colonne par colonne de meddic_fiches
+
+        Returns:
+            list: Identifiants des fiches créées, dans l'ordre du DataFrame
+        """
+        if fiches_df.empty:
+            return []
+
+        columns = list(fiches_df.columns)
+        invalid = [column for column in columns
+                   if column not in self.columns or column in ('id', 'created_at', 'updated_at')]
+        if invalid:
+            raise ValueError(f"Colonnes non insérables: {', '.join(invalid)}")
+
+        # Types Python natifs et None pour les valeurs manquantes
+        values = fiches_df.astype(object).where(fiches_df.notna(), None)
+
+        with self.pool.transaction() as conn:
+            # Sous BEGIN IMMEDIATE, les identifiants AUTOINCREMENT du lot suivent ce maximum
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM meddic_fiches").fetchone()[0]
+            conn.executemany(f"""
+                INSERT INTO meddic_fiches ({', '.join(columns)})
+                VALUES ({', '.join('?' * len(columns))})
+            """, values.itertuples(index=False, name=None))
+
+            if self.audit:
+                conn.execute("""
+                    INSERT INTO audit_log (fiche_id, action)
+                    SELECT id, 'IMPORT' FROM meddic_fiches WHERE id > ?
+                """, (last_id,))
+
+            rows = conn.execute(
+                "SELECT id FROM meddic_fiches WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def get_all_fiches(self, include_stats=False, columns="full"):
+        """
+        Récupère toutes les fiches MEDDIC avec statistiques optionnelles
+
+        Args:
+            include_stats (bool): Ajoute les colonnes calculées (date formatée)
+            columns (str | list): Projection nommée ("summary", "full") ou liste de colonnes
+
+        Returns:
+            DataFrame: Fiches triées par date de mise à jour décroissante
+        """
+        select_list = self._select_list(columns)
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query(
+                f"SELECT {select_list} FROM meddic_fiches ORDER BY updated_at DESC, id DESC", conn
+            )
+
+        if include_stats and not df.empty and 'meeting_date' in df.columns:
+            # Le score de complétude est persisté à l'écriture (colonne completion_score)
+            df['formatted_date'] = df['meeting_date'].apply(format_date)
+
+        return df
+
+    def _build_filter_clause(self, filters):
+        """Construit la clause WHERE paramétrée correspondant aux filtres"""
+        conditions = []
+        params = []
+        for column, value in (filters or {}).items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Filtre non supporté: {column}")
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def query_fiches(self, filters=None, sort_by='updated_at', descending=True, page=1, page_size=20,
+                     columns="full"):
+        """
+        Récupère une page de fiches filtrées et triées directement en SQL
+
+        Args:
+            filters (dict): Valeurs par colonne de FILTER_COLUMNS (None = pas de filtre)
+            sort_by (str): Colonne de tri parmi SORT_COLUMNS
+            descending (bool): Tri décroissant
+            page (int): Numéro de page (à partir de 1)
+            page_size (int): Nombre de fiches par page
+            columns (str | list): Projection nommée ("summary", "full") ou liste de colonnes
+
+        Returns:
+            tuple: (DataFrame de la page, nombre total de fiches correspondant aux filtres)
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Tri non supporté: {sort_by}")
+
+        where, params = self._build_filter_clause(filters)
+        select_list = self._select_list(columns)
+        direction = "DESC" if descending else "ASC"
+        offset = (max(int(page), 1) - 1) * page_size
+
+        with self.pool.connection() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM meddic_fiches {where}", params).fetchone()[0]
+            # L'id départage les égalités pour une pagination stable
+            df = pd.read_sql_query(
+                f"""
+                SELECT {select_list} FROM meddic_fiches {where}
+                ORDER BY {sort_by} {direction}, id {direction}
+                LIMIT ? OFFSET ?
+                """,
+                conn,
+                params=params + [page_size, offset]
+            )
+
+        return df, total
+
+    def iter_fiches(self, filters=None, columns="full", chunk_size=1000):
+        """
+        Parcourt les fiches par paquets, sans tout charger en mémoire
+
+        Chaque paquet est lu avec sa propre connexion du pool, à la suite du dernier
+        (updated_at, id) lu : aucune connexion ni lecture n'est gardée ouverte pendant
+        que l'appelant traite un paquet. Une fiche modifiée pendant le parcours passe
+        en tête de l'ordre de tri et n'est donc pas relue.
+
+        Args:
+            filters (dict): Valeurs par colonne de FILTER_COLUMNS (None = pas de filtre)
+            columns (str | list): Projection nommée ou liste de colonnes
+            chunk_size (int): Nombre de lignes par paquet
+
+        Yields:
+            tuple: (noms des colonnes, liste de lignes) ; au moins un paquet, éventuellement vide
+        """
+        where, params = self._build_filter_clause(filters)
+        select_list = self._select_list(columns)
+
+        key = None
+        while True:
+            page_where, page_params = where, params
+            if key is not None:
+                page_where = f"{where} AND {KEYSET_CONDITION}" if where else f"WHERE {KEYSET_CONDITION}"
+                page_params = params + list(key)
+
+            # Clé de pagination ajoutée en fin de ligne, retirée avant de renvoyer le paquet
+            with self.pool.connection() as conn:
+                cursor = conn.execute(
+                    f"""
+                    SELECT {select_list}, updated_at, id FROM meddic_fiches {page_where}
+                    ORDER BY updated_at DESC, id DESC
+                    LIMIT ?
+                    """,
+                    page_params + [chunk_size]
+                )
+                column_names = [desc[0] for desc in cursor.description][:-2]
+                rows = cursor.fetchall()
+
+            if rows or key is None:
+                yield column_names, [row[:-2] for row in rows]
+            if len(rows) < chunk_size:
+                return
+            key = rows[-1][-2:]
+
+    def get_distinct_values(self, column):
+        """Retourne les valeurs distinctes non vides d'une colonne filtrable"""
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Filtre non supporté: {column}")
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT {column} FROM meddic_fiches WHERE {column} IS NOT NULL ORDER BY {column}"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def has_fiches(self):
+        """Indique si la base contient au moins une fiche (quel que soit son statut)"""
+        with self.pool.connection() as conn:
+            return bool(conn.execute("SELECT EXISTS(SELECT 1 FROM meddic_fiches)").fetchone()[0])
+
+    def get_fiche_by_id(self, fiche_id):
+        """Récupère une fiche par son ID"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM meddic_fiches WHERE id=?", (fiche_id,))
+            result = cursor.fetchone()
+
+            if result:
+                columns = [desc[0] for desc in cursor.description]
+                return dict(zip(columns, result))
+
+        return None
+
+    def delete_fiche(self, fiche_id):
+        """Supprime une fiche avec audit trail"""
+        with self.pool.transaction() as conn:
+            conn.execute("DELETE FROM meddic_fiches WHERE id=?", (fiche_id,))
+
+        # Audit trail pour suppression
+        if self.audit:
+            self.audit.record(fiche_id, 'DELETE')
+
+    def get_audit_log(self, fiche_id):
+        """Récupère l'historique d'audit d'une fiche, du plus récent au plus ancien"""
+        if self.audit:
+            self.audit.flush()
+        with self.pool.connection() as conn:
+            return pd.read_sql_query("""
+                SELECT action, field_changed, old_value, new_value, timestamp
+                FROM audit_log
+                WHERE fiche_id = ?
+                ORDER BY timestamp DESC, id DESC
+            """, conn, params=(fiche_id,))
+
+    def get_statistics(self):
+        """
+        Calcule les statistiques globales directement en SQL
+
+        Les agrégats s'appuient sur les colonnes persistées (completion_score,
+        status) et sur les index, sans jamais lire les champs texte MEDDIC.
+
+        Returns:
+            dict: Même structure que utils.get_statistics
+        """
+        with self.pool.connection() as conn:
+            total, avg_completion, complete_fiches, qualified = conn.execute("""
+                SELECT COUNT(*), AVG(completion_score),
+                       SUM(completion_score = 100), SUM(status = 'Qualifié')
+                FROM meddic_fiches
+            """).fetchone()
+
+            if not total:
+                return {}
+
+            companies_count = conn.execute(
+                "SELECT COUNT(DISTINCT company) FROM meddic_fiches"
+            ).fetchone()[0]
+            commercials_count = conn.execute(
+                "SELECT COUNT(DISTINCT commercial) FROM meddic_fiches"
+            ).fetchone()[0]
+            by_status = conn.execute("""
+                SELECT status, COUNT(*), AVG(completion_score)
+                FROM meddic_fiches
+                WHERE status IS NOT NULL
+                GROUP BY status
+                ORDER BY COUNT(*) DESC
+            """).fetchall()
+
+        return {
+            'total_fiches': total,
+            'avg_completion': avg_completion,
+            'complete_fiches': complete_fiches,
+            'status_distribution': {status: count for status, count, _ in by_status},
+            'companies_count': companies_count,
+            'commercials_count': commercials_count,
+            'qualified_rate': (qualified / total) * 100,
+            'avg_completion_by_status': {status: avg for status, _, avg in by_status}
+        }
+
+    def search_fiches(self, search_term, limit=50):
+        """
+        Recherche plein texte dans les fiches, classée par pertinence
+
+        Chaque mot est recherché en préfixe et sans tenir compte des accents
+        ("negoc" trouve "Négociation") ; tous les mots doivent être présents.
+
+        Args:
+            search_term (str): Terme de recherche
+            limit (int): Nombre maximal de résultats
+
+        Returns:
+            DataFrame: Fiches trouvées, les plus pertinentes en premier
+        """
+        words = re.findall(r"\w+", search_term or "")
+        if not words:
+            return self.query_fiches(page_size=limit)[0]
+
+        if not self.fts_enabled:
+            fiches_df = self.get_all_fiches()
+            return search_fiches(fiches_df, search_term).head(limit)
+
+        # Chaque mot est mis entre guillemets pour neutraliser la syntaxe FTS5
+        match_query = ' '.join(f'"{word}"*' for word in words)
+
+        with self.pool.connection() as conn:
+            # Les correspondances sur l'entreprise et le client pèsent davantage
+            return pd.read_sql_query(
+                """
+                SELECT f.* FROM meddic_fiches_fts
+                JOIN meddic_fiches f ON f.id = meddic_fiches_fts.rowid
+                WHERE meddic_fiches_fts MATCH ?
+                ORDER BY bm25(meddic_fiches_fts, 10.0, 8.0, 4.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+                LIMIT ?
+                """,
+                conn,
+                params=(match_query, limit)
+            )
+
+    def close(self):
+        """Vide l'audit en attente et ferme les connexions du pool"""
+        if self.audit:
+            self.audit.close()
+        self.pool.close()
+
+# Chaque méthode publique est mesurée (panneau Performance)
+instrument_class(MEDDICDatabase, "sql")
@@ -0,0 +1,158 @@
+import csv
+import gzip
+import io
+import tempfile
+from datetime import datetime
+
+# Import des modules locaux
+from config import *
+
+# Formats d'export : extension et type MIME
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "xlsx": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "pdf": (".pdf", "application/pdf"),
+    "pdf.zip": (".zip", "application/zip")
+}
+
+# Au-delà de cette taille, le fichier d'export temporaire est écrit sur disque
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+def get_available_formats():
+    """
+    Liste les formats d'export activés dans EXPORT_CONFIG
+
+    Returns:
+        list: Formats disponibles (clés de EXPORT_FORMATS)
+    """
+    formats = []
+    if EXPORT_CONFIG["csv_enabled"]:
+        formats += ["csv", "csv.gz"]
+    if EXPORT_CONFIG["excel_enabled"]:
+        formats.append("xlsx")
+    if EXPORT_CONFIG["pdf_enabled"]:
+        # Rapport unique avec sommaire, ou archive d'un PDF par fiche
+        formats += ["pdf", "pdf.zip"]
+    return formats
+
+def get_export_filename(export_format, prefix="meddic_export"):
+    """Nom de fichier horodaté pour un format d'export"""
+    extension, _ = EXPORT_FORMATS[export_format]
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+
+def write_csv(db, fileobj, filters=None, compress=False, chunk_size=EXPORT_CONFIG["chunk_size"]):
+    """
+    Écrit les fiches au format CSV, par paquets, sans les charger en mémoire
+
+    Args:
+        db (MEDDICDatabase): Base de données source
+        fileobj (file): Fichier binaire de destination
+        filters (dict): Filtres de MEDDICDatabase.query_fiches
+        compress (bool): Compression gzip
+        chunk_size (int): Nombre de lignes lues par paquet
+
+    Returns:
+        int: Nombre de fiches exportées
+    """
+    raw = gzip.GzipFile(fileobj=fileobj, mode='wb') if compress else fileobj
+    text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    count = 0
+    try:
+        for index, (columns, rows) in enumerate(db.iter_fiches(filters, chunk_size=chunk_size)):
+            if index == 0:
+                writer.writerow(columns)
+            writer.writerows(rows)
+            count += len(rows)
+        text.flush()
+    finally:
+        # Détache le wrapper texte pour ne pas fermer le fichier de l'appelant
+        text.detach()
+        if compress:
+            raw.close()
+    return count
+
+def write_xlsx(db, fileobj, filters=None, chunk_size=EXPORT_CONFIG["chunk_size"]):
+    """
+    Écrit les fiches dans un classeur Excel en mode write-only (mémoire constante)
+
+    Args:
+        db (MEDDICDatabase): Base de données source
+        fileobj (file): Fichier binaire de destination
+        filters (dict): Filtres de MEDDICDatabase.query_fiches
+        chunk_size (int): Nombre de lignes lues par paquet
+
+    Returns:
+        int: Nombre de fiches exportées
+    """
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    except ImportError:
+        raise ImportError("L'export Excel nécessite openpyxl : pip install openpyxl")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Fiches MEDDIC")
+    count = 0
+    for index, (columns, rows) in enumerate(db.iter_fiches(filters, chunk_size=chunk_size)):
+        if index == 0:
+            sheet.append(columns)
+        for row in rows:
+            # Excel refuse les caractères de contrôle présents dans certaines notes
+            sheet.append([
+                ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value
+                for value in row
+            ])
+        count += len(rows)
+    workbook.save(fileobj)
+    return count
+
+def iter_fiche_records(db, filters=None, chunk_size=EXPORT_CONFIG["chunk_size"]):
+    """
+    Parcourt les fiches une par une sous forme de dictionnaires
+
+    Args:
+        db (MEDDICDatabase): Base de données source
+        filters (dict): Filtres de MEDDICDatabase.query_fiches
+        chunk_size (int): Nombre de lignes lues par paquet
+
+    Yields:
+        dict: Données d'une fiche
+    """
+    for columns, rows in db.iter_fiches(filters, chunk_size=chunk_size):
+        for row in rows:
+            yield dict(zip(columns, row))
+
+def export_fiches(db, export_format="csv", filters=None):
+    """
+    Produit un export complet dans un fichier temporaire
+
+    Le fichier reste en mémoire tant qu'il est petit puis bascule sur disque :
+    l'empreinte mémoire ne dépend pas du nombre de fiches.
+
+    Args:
+        db (MEDDICDatabase): Base de données source
+        export_format (str): csv, csv.gz, xlsx, pdf ou pdf.zip
+        filters (dict): Filtres de MEDDICDatabase.query_fiches
+
+    Returns:
+        SpooledTemporaryFile: Fichier d'export positionné au début
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {export_format}")
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    if export_format == "xlsx":
+        write_xlsx(db, output, filters)
+    elif export_format == "pdf":
+        # Import local : fpdf n'est chargé que pour les exports PDF
+        from pdf_generator import MEDDICPDFGenerator
+        output.write(MEDDICPDFGenerator().generate_report_pdf(iter_fiche_records(db, filters)))
+    elif export_format == "pdf.zip":
+        from pdf_generator import write_pdf_zip
+        write_pdf_zip(iter_fiche_records(db, filters), output)
+    else:
+        write_csv(db, output, filters, compress=(export_format == "csv.gz"))
+    output.seek(0)
+    return output
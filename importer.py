@@ -0,0 +1,168 @@
+"""Import en masse de fiches MEDDIC depuis un fichier CSV ou Excel
+
+Le fichier est lu par lots : chaque lot est validé ligne à ligne avec les règles
+du formulaire, la priorité et la complétude sont calculées pour tout le lot en
+une fois, puis les fiches valides sont insérées dans une seule transaction.
+Les lignes rejetées sont reportées avec leur numéro de ligne dans le fichier.
+
+Utilisation en ligne de commande :
+    python importer.py fiches.csv                # import
+    python importer.py fiches.xlsx --dry-run     # validation seule
+"""
+import argparse
+import os
+
+import pandas as pd
+
+# Import des modules locaux
+from config import *
+from utils import validate_fiche_data, get_priority_levels, get_completion_frame
+from database import MEDDICDatabase, FICHE_FIELDS
+
+# Colonnes reprises du fichier importé
+IMPORT_FIELDS = FICHE_FIELDS
+
+REQUIRED_IMPORT_FIELDS = ['client_name', 'company']
+
+# Excel : .xlsx seulement (openpyxl), l'ancien format .xls demanderait xlrd
+IMPORT_FORMATS = (".csv", ".csv.gz", ".xlsx")
+
+def _get_source_name(source):
+    """Nom du fichier importé (chemin ou fichier téléversé)"""
+    return source if isinstance(source, str) else getattr(source, "name", "")
+
+def iter_import_batches(source, batch_size=IMPORT_CONFIG["batch_size"]):
+    """
+    Lit un fichier d'import par lots
+
+    Les CSV sont lus en flux ; un classeur Excel est lu en entier puis découpé.
+
+    Args:
+        source (str | file): Chemin ou fichier (son nom détermine le format)
+        batch_size (int): Nombre de lignes par lot
+
+    Yields:
+        DataFrame: Lot de lignes, toutes les valeurs lues comme du texte
+    """
+    name = _get_source_name(source).lower()
+    if name.endswith(".csv") or name.endswith(".csv.gz"):
+        compression = "gzip" if name.endswith(".gz") else None
+        yield from pd.read_csv(source, dtype=str, chunksize=batch_size, compression=compression)
+    elif name.endswith(".xlsx"):
+        fiches_df = pd.read_excel(source, dtype=str)
+        for start in range(0, len(fiches_df), batch_size):
+            yield fiches_df.iloc[start:start + batch_size]
+    else:
+        raise ValueError(f"Format d'import non supporté: {name or 'inconnu'} ({', '.join(IMPORT_FORMATS)})")
+
+def _normalize_batch(batch_df):
+    """Colonnes attendues, textes nettoyés et None pour les valeurs vides"""
+    batch_df = batch_df.rename(columns=lambda column: str(column).strip().lower())
+    missing = [field for field in REQUIRED_IMPORT_FIELDS if field not in batch_df.columns]
+    if missing:
+        raise ValueError(f"Colonnes obligatoires absentes du fichier: {', '.join(missing)}")
+
+    fiches_df = batch_df.reindex(columns=IMPORT_FIELDS).astype(object)
+    for field in IMPORT_FIELDS:
+        values = fiches_df[field].where(fiches_df[field].notna(), '').astype(str).str.strip()
+        fiches_df[field] = values.astype(object).where(values.ne(''), None)
+
+    # Les dates Excel sont lues avec une heure nulle : on ne garde que le jour
+    dates = fiches_df['meeting_date']
+    midnight = dates.notna() & dates.astype(str).str[10:].isin(['', ' 00:00:00', 'T00:00:00'])
+    fiches_df['meeting_date'] = dates.where(~midnight, dates.astype(str).str[:10].astype(object))
+
+    # Même statut par défaut que la base et le formulaire
+    fiches_df['status'] = fiches_df['status'].fillna(MEDDIC_STATUS[0])
+    return fiches_df
+
+def prepare_batch(batch_df, first_row=2):
+    """
+    Valide un lot et calcule la priorité et la complétude des fiches valides
+
+    Args:
+        batch_df (DataFrame): Lot lu par iter_import_batches
+        first_row (int): Numéro de ligne de la première fiche du lot dans le fichier
+
+    Returns:
+        tuple: (DataFrame des fiches prêtes à insérer, liste des erreurs par ligne)
+    """
+    fiches_df = _normalize_batch(batch_df).reset_index(drop=True)
+
+    errors = []
+    valid = []
+    for position, fiche_data in enumerate(fiches_df.to_dict('records')):
+        is_valid, fiche_errors = validate_fiche_data(fiche_data)
+        valid.append(is_valid)
+        if not is_valid:
+            errors.append({"row": first_row + position, "errors": fiche_errors})
+
+    fiches_df = fiches_df[valid]
+    if fiches_df.empty:
+        return fiches_df, errors
+
+    fiches_df = fiches_df.assign(priority=get_priority_levels(fiches_df))
+    return pd.concat([fiches_df, get_completion_frame(fiches_df)], axis=1), errors
+
+def import_fiches(db, source, batch_size=IMPORT_CONFIG["batch_size"], dry_run=False):
+    """
+    Importe les fiches d'un fichier CSV ou Excel
+
+    Chaque lot valide est inséré dans sa propre transaction : une erreur de lecture
+    en cours de fichier laisse en base les lots déjà importés.
+
+    Args:
+        db (MEDDICDatabase): Base de données cible
+        source (str | file): Chemin ou fichier à importer
+        batch_size (int): Nombre de lignes par lot et par transaction
+        dry_run (bool): Valide le fichier sans rien écrire
+
+    Returns:
+        dict: Rapport d'import (total, imported, rejected, errors, ids)
+    """
+    report = {"total": 0, "imported": 0, "rejected": 0, "errors": [], "ids": []}
+
+    # Ligne 1 : en-tête du fichier
+    first_row = 2
+    for batch_df in iter_import_batches(source, batch_size):
+        fiches_df, errors = prepare_batch(batch_df, first_row)
+        first_row += len(batch_df)
+
+        report["total"] += len(batch_df)
+        report["rejected"] += len(errors)
+        report["errors"].extend(errors)
+
+        if dry_run:
+            report["imported"] += len(fiches_df)
+        else:
+            ids = db.insert_fiches(fiches_df)
+            report["imported"] += len(ids)
+            report["ids"].extend(ids)
+
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Import en masse de fiches MEDDIC")
+    parser.add_argument("file", help=f"Fichier à importer ({', '.join(IMPORT_FORMATS)})")
+    parser.add_argument("--db", default=DATABASE_CONFIG["db_name"], help="Chemin de la base SQLite")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_CONFIG["batch_size"],
+                        help="Lignes par transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Valider sans importer")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.error(f"Fichier introuvable: {args.file}")
+
+    db = MEDDICDatabase(args.db)
+    try:
+        report = import_fiches(db, args.file, batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    for error in report["errors"]:
+        print(f"Ligne {error['row']}: {'; '.join(error['errors'])}")
+    verb = "valide(s)" if args.dry_run else "importée(s)"
+    print(f"{report['imported']} fiche(s) {verb}, {report['rejected']} rejetée(s) sur {report['total']}")
+
+if __name__ == "__main__":
+    main()
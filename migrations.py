@@ -0,0 +1,321 @@
+"""Migrations versionnées du schéma de la base MEDDIC
+
+Chaque migration est identifiée par un numéro de version croissant et appliquée
+une seule fois, dans l'ordre, au démarrage de l'application. La table
+schema_version conserve l'historique des migrations appliquées, ce qui permet de
+mettre à niveau une base existante sur place.
+"""
+import logging
+import sqlite3
+
+from utils import is_filled
+
+logger = logging.getLogger(__name__)
+
+def _migration_001_initial_schema(conn):
+    """Tables des fiches MEDDIC et de l'audit trail"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS meddic_fiches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            client_name TEXT NOT NULL,
+            company TEXT NOT NULL,
+            meeting_date DATE,
+            commercial TEXT,
+            metrics TEXT,
+            economic_buyer TEXT,
+            decision_criteria TEXT,
+            decision_process TEXT,
+            identify_pain TEXT,
+            champion TEXT,
+            status TEXT DEFAULT 'En cours',
+            notes TEXT,
+            priority TEXT DEFAULT 'Moyenne',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fiche_id INTEGER,
+            action TEXT,
+            field_changed TEXT,
+            old_value TEXT,
+            new_value TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (fiche_id) REFERENCES meddic_fiches(id)
+        )
+    """)
+
+def _migration_002_secondary_indexes(conn):
+    """Index pour le tri par date de mise à jour, les filtres et l'audit par fiche"""
+    # Tri par défaut des listes (ORDER BY updated_at DESC, id DESC)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fiches_updated_at
+        ON meddic_fiches (updated_at DESC, id DESC)
+    """)
+
+    # Filtres : l'index couvre aussi le tri, et les SELECT DISTINCT sur la colonne
+    for column in ('status', 'company', 'commercial'):
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_fiches_{column}
+            ON meddic_fiches ({column}, updated_at DESC, id DESC)
+        """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_audit_log_fiche
+        ON audit_log (fiche_id, timestamp)
+    """)
+
+# Colonnes texte indexées en plein texte (FTS5)
+FTS_COLUMNS = [
+    'company', 'client_name', 'commercial', 'metrics', 'economic_buyer',
+    'decision_criteria', 'decision_process', 'identify_pain', 'champion', 'notes'
+]
+
+def create_fts_triggers(conn):
+    """Triggers qui maintiennent l'index plein texte synchronisé avec meddic_fiches"""
+    columns = ', '.join(FTS_COLUMNS)
+    new_values = ', '.join(f"new.{column}" for column in FTS_COLUMNS)
+    old_values = ', '.join(f"old.{column}" for column in FTS_COLUMNS)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS meddic_fiches_fts_insert AFTER INSERT ON meddic_fiches BEGIN
+            INSERT INTO meddic_fiches_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS meddic_fiches_fts_delete AFTER DELETE ON meddic_fiches BEGIN
+            INSERT INTO meddic_fiches_fts (meddic_fiches_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    # Seules les modifications des colonnes texte réindexent la fiche
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS meddic_fiches_fts_update AFTER UPDATE OF {columns} ON meddic_fiches BEGIN
+            INSERT INTO meddic_fiches_fts (meddic_fiches_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO meddic_fiches_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+
+def drop_fts_triggers(conn):
+    """Supprime les triggers FTS (chargements massifs suivis d'une reconstruction)"""
+    for suffix in ('insert', 'delete', 'update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS meddic_fiches_fts_{suffix}")
+
+def rebuild_fts_index(conn):
+    """Reconstruit entièrement l'index plein texte depuis meddic_fiches"""
+    conn.execute("INSERT INTO meddic_fiches_fts (meddic_fiches_fts) VALUES ('rebuild')")
+
+def _create_full_text_search(conn):
+    """
+    Crée l'index plein texte, ses triggers, et l'alimente
+
+    Returns:
+        bool: False si SQLite est compilé sans FTS5
+    """
+    try:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS meddic_fiches_fts USING fts5(
+                {', '.join(FTS_COLUMNS)},
+                content='meddic_fiches',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """)
+    except sqlite3.OperationalError:
+        return False
+
+    create_fts_triggers(conn)
+    rebuild_fts_index(conn)
+    return True
+
+def _migration_003_full_text_search(conn):
+    """Index plein texte FTS5 des champs MEDDIC, insensible aux accents"""
+    # Sans FTS5, la version est tout de même enregistrée : ensure_full_text_search
+    # signale l'absence de l'index et le crée dès qu'un SQLite avec FTS5 ouvre la base
+    _create_full_text_search(conn)
+
+def _migration_004_completion_columns(conn):
+    """Score de complétude et indicateurs de remplissage persistés à l'écriture"""
+    # Liste figée : la migration ne doit pas dépendre de la configuration courante
+    meddic_fields = [
+        'metrics', 'economic_buyer', 'decision_criteria',
+        'decision_process', 'identify_pain', 'champion'
+    ]
+    flag_columns = [f"{field}_filled" for field in meddic_fields]
+
+    for column in flag_columns:
+        conn.execute(f"ALTER TABLE meddic_fiches ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE meddic_fiches ADD COLUMN completion_score REAL NOT NULL DEFAULT 0")
+
+    # Recalcul des fiches existantes par lots, avec les mêmes règles que l'application
+    cursor = conn.execute(f"SELECT id, {', '.join(meddic_fields)} FROM meddic_fiches")
+    while True:
+        rows = cursor.fetchmany(1000)
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            flags = [int(is_filled(value)) for value in row[1:]]
+            updates.append(flags + [sum(flags) / len(meddic_fields) * 100, row[0]])
+        conn.executemany(f"""
+            UPDATE meddic_fiches
+            SET {', '.join(f'{column} = ?' for column in flag_columns)}, completion_score = ?
+            WHERE id = ?
+        """, updates)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fiches_completion
+        ON meddic_fiches (completion_score, status)
+    """)
+
+def _migration_005_statistics_index(conn):
+    """Index couvrant pour les agrégats par statut (sans lecture des lignes)"""
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fiches_status_completion
+        ON meddic_fiches (status, completion_score)
+    """)
+
+def create_data_version_triggers(conn):
+    """Triggers qui incrémentent la version des données à chaque écriture sur les fiches"""
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS meddic_fiches_version_{event.lower()}
+            AFTER {event} ON meddic_fiches BEGIN
+                UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+def drop_data_version_triggers(conn):
+    """Supprime les triggers de version (chargements massifs : incrémenter une seule fois ensuite)"""
+    for event in ('insert', 'update', 'delete'):
+        conn.execute(f"DROP TRIGGER IF EXISTS meddic_fiches_version_{event}")
+
+def bump_data_version(conn):
+    """Incrémente manuellement la version des données"""
+    conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+def _migration_006_data_version(conn):
+    """Compteur de version des données, visible par tous les processus"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+    create_data_version_triggers(conn)
+
+# Liste ordonnée des migrations : (version, description, fonction)
+MIGRATIONS = [
+    (1, "Schéma initial des fiches et de l'audit trail", _migration_001_initial_schema),
+    (2, "Index secondaires sur meddic_fiches et audit_log", _migration_002_secondary_indexes),
+    (3, "Index plein texte FTS5 des fiches", _migration_003_full_text_search),
+    (4, "Score de complétude persisté et indicateurs par champ", _migration_004_completion_columns),
+    (5, "Index couvrant des statistiques par statut", _migration_005_statistics_index),
+    (6, "Version des données pour l'invalidation des caches", _migration_006_data_version),
+]
+
+def get_schema_version(conn):
+    """
+    Retourne la version courante du schéma
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base
+
+    Returns:
+        int: Dernière version appliquée (0 pour une base vierge)
+    """
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def _fts_table_exists(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='meddic_fiches_fts'"
+    ).fetchone() is not None
+
+def ensure_full_text_search(conn):
+    """
+    Crée l'index plein texte s'il manque à une base déjà migrée
+
+    C'est le cas d'une base migrée par un SQLite compilé sans FTS5 puis ouverte
+    par un SQLite qui le prend en charge.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base (mode autocommit)
+
+    Returns:
+        bool: True si l'index plein texte est disponible
+    """
+    if _fts_table_exists(conn):
+        return True
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        created = _fts_table_exists(conn) or _create_full_text_search(conn)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    if not created:
+        logger.warning("SQLite compilé sans FTS5 : la recherche utilise le filtre pandas, plus lent")
+    return created
+
+def apply_migrations(conn, migrations=MIGRATIONS):
+    """
+    Applique les migrations en attente, chacune dans sa propre transaction
+
+    La connexion doit être en mode autocommit (isolation_level=None), les
+    transactions étant ouvertes explicitement avec BEGIN IMMEDIATE pour que deux
+    processus démarrant en même temps n'appliquent pas deux fois la même migration.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base
+        migrations (list): Migrations (version, description, fonction) triées
+
+    Returns:
+        list: Versions appliquées lors de cet appel
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    applied = []
+    for version, description, migrate in migrations:
+        if version <= get_schema_version(conn):
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Nouvelle vérification sous verrou : un autre processus a pu l'appliquer
+            if version <= get_schema_version(conn):
+                conn.execute("ROLLBACK")
+                continue
+            migrate(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        applied.append(version)
+
+    if get_schema_version(conn) >= 3:
+        ensure_full_text_search(conn)
+
+    if applied:
+        # Met à jour les statistiques du planificateur pour les nouveaux index
+        conn.execute("PRAGMA optimize")
+
+    return applied
@@ -0,0 +1,147 @@
+"""Cache disque des documents générés pour les fiches (PDF, résumés Markdown)
+
+Chaque document est indexé par une empreinte des champs qui servent à le
+produire : une fiche inchangée est resservie par simple lecture de fichier,
+une fiche modifiée obtient une nouvelle empreinte. Les anciennes entrées ne
+sont jamais invalidées explicitement, elles sont évincées quand la taille
+totale du cache dépasse la limite configurée (les moins récemment lues d'abord).
+"""
+import os
+import threading
+
+# Import des modules locaux
+from config import *
+from utils import get_fiche_content_hash, generate_fiche_summary, SUMMARY_RENDER_VERSION
+from pdf_generator import PDF_FIELDS, PDF_RENDER_VERSION
+
+# Champs affichés par generate_fiche_summary
+SUMMARY_FIELDS = [
+    'company', 'client_name', 'commercial', 'meeting_date', 'status', 'notes'
+] + REQUIRED_MEDDIC_FIELDS
+
+class OutputCache:
+    """Cache de documents sur disque, borné en taille"""
+
+    def __init__(self, cache_dir=EXPORT_CONFIG["output_cache_dir"],
+                 max_bytes=EXPORT_CONFIG["output_cache_max_mb"] * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}{extension}")
+
+    def get_or_create(self, key, extension, render):
+        """
+        Retourne le document en cache, ou le produit et l'enregistre
+
+        Args:
+            key (str): Empreinte du contenu
+            extension (str): Extension du fichier (.pdf, .md)
+            render (callable): Produit le document (bytes) en cas d'absence
+
+        Returns:
+            bytes: Contenu du document
+        """
+        path = self._path(key, extension)
+        try:
+            with open(path, 'rb') as cached:
+                data = cached.read()
+            # La date de modification sert d'ordre d'éviction (moins récemment lu)
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            pass
+
+        data = render()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Écriture atomique : un lecteur concurrent ne voit jamais un fichier partiel
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as output:
+            output.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+        return data
+
+    def _entries(self):
+        """Fichiers du cache : (chemin, taille, date de dernière lecture)"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment lues jusqu'à 90 % de la limite"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * 0.9
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def clear(self):
+        """Vide entièrement le cache"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+
+def get_fiche_pdf(cache, generator, fiche_data):
+    """
+    PDF d'une fiche, servi depuis le cache si son contenu n'a pas changé
+
+    Args:
+        cache (OutputCache): Cache disque
+        generator (MEDDICPDFGenerator): Générateur utilisé en cas d'absence
+        fiche_data (dict): Données de la fiche
+
+    Returns:
+        bytes: Contenu du PDF
+    """
+    key = get_fiche_content_hash(
+        fiche_data, PDF_FIELDS, f"pdf-{PDF_RENDER_VERSION}-{generator.font_family}"
+    )
+    return cache.get_or_create(key, ".pdf", lambda: generator.generate_fiche_pdf(fiche_data))
+
+def get_fiche_summary(cache, fiche_data):
+    """
+    Résumé Markdown d'une fiche (generate_fiche_summary), servi depuis le cache
+
+    Args:
+        cache (OutputCache): Cache disque
+        fiche_data (dict): Données de la fiche
+
+    Returns:
+        bytes: Résumé encodé en UTF-8
+    """
+    key = get_fiche_content_hash(fiche_data, SUMMARY_FIELDS, f"summary-{SUMMARY_RENDER_VERSION}")
+    return cache.get_or_create(
+        key, ".md", lambda: generate_fiche_summary(fiche_data).encode('utf-8')
+    )
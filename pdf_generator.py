@@ -0,0 +1,441 @@
+"""Génération des PDF des fiches MEDDIC
+
+Une fiche est dessinée par MEDDICPDFGenerator.render_fiche sur un document
+FPDF, ce qui permet de produire aussi bien un PDF par fiche qu'un rapport
+regroupant plusieurs fiches. Les exports de nombreuses fiches en PDF séparés
+répartissent le rendu, coûteux en CPU, sur un pool de processus.
+
+Le pool est démarré dans un interpréteur dédié, lancé par write_pdf_zip :
+    python -m pdf_generator fiches.jsonl fiches.zip [--workers N]
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain
+
+from fpdf import FPDF, XPos, YPos
+from fpdf.outline import TableOfContents
+
+# Import des modules locaux
+from config import *
+from utils import is_filled, get_fiche_pdf_filename
+from perf import timed
+
+# Plages Unicode conservées dans la police embarquée : latin, grec, cyrillique,
+# ponctuation typographique, symboles monétaires, flèches et pictogrammes courants
+PDF_FONT_UNICODE_RANGES = [
+    (0x0020, 0x024F), (0x0370, 0x04FF), (0x2000, 0x206F),
+    (0x20A0, 0x20CF), (0x2190, 0x21FF), (0x2600, 0x27BF)
+]
+
+# Remplacements typographiques avant repli sur une police de base (latin-1)
+LATIN1_REPLACEMENTS = {
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+    '\u2013': '-', '\u2014': '-', '\u2026': '...', '\u2022': '-',
+    '\u20ac': 'EUR', '\u00a0': ' '
+}
+
+# Champs dessinés par render_fiche (empreinte du cache des PDF)
+PDF_FIELDS = ['company', 'client_name', 'commercial', 'meeting_date'] + REQUIRED_MEDDIC_FIELDS
+
+# À incrémenter à chaque changement de mise en page : invalide les PDF en cache
+PDF_RENDER_VERSION = 1
+
+_font_cache = {}
+
+def _build_font_subset(font_path):
+    """
+    Réduit une police TTF aux plages PDF_FONT_UNICODE_RANGES, une seule fois
+
+    Le fichier réduit est conservé dans le répertoire temporaire : les processus
+    suivants (et les processus du pool de rendu) le réutilisent directement.
+    L'analyse d'une police complète par fpdf2 coûte plus que le rendu d'une fiche.
+
+    Args:
+        font_path (str): Chemin de la police d'origine
+
+    Returns:
+        str: Chemin de la police réduite (ou d'origine si la réduction échoue)
+    """
+    stat = os.stat(font_path)
+    key = f"{os.path.abspath(font_path)}|{stat.st_size}|{stat.st_mtime}|{PDF_FONT_UNICODE_RANGES}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    font_dir = os.path.join(tempfile.gettempdir(), "meddic_pdf_fonts")
+    subset_path = os.path.join(font_dir, f"{os.path.splitext(os.path.basename(font_path))[0]}-{digest}.ttf")
+    if os.path.exists(subset_path):
+        return subset_path
+
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+
+        options = subset.Options()
+        options.notdef_outline = True
+        options.name_IDs = ['*']
+        options.layout_features = []
+        options.drop_tables += ['FFTM']
+        font = TTFont(font_path)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=[
+            code for first, last in PDF_FONT_UNICODE_RANGES for code in range(first, last + 1)
+        ])
+        subsetter.subset(font)
+
+        os.makedirs(font_dir, exist_ok=True)
+        # Écriture atomique : plusieurs processus peuvent construire la même police
+        temp_path = f"{subset_path}.{os.getpid()}.tmp"
+        font.save(temp_path)
+        os.replace(temp_path, subset_path)
+        return subset_path
+    except Exception:
+        return font_path
+
+def load_pdf_fonts(candidates=EXPORT_CONFIG["pdf_font_candidates"]):
+    """
+    Trouve la première police Unicode disponible parmi les candidates
+
+    Le résultat est mis en cache pour la durée du processus.
+
+    Args:
+        candidates (list): Couples (police normale, police grasse)
+
+    Returns:
+        dict: Fichiers par style ('' et 'B'), ou None si aucune police n'est trouvée
+    """
+    key = tuple(tuple(pair) for pair in candidates)
+    if key not in _font_cache:
+        _font_cache[key] = None
+        for regular_path, bold_path in candidates:
+            if os.path.exists(regular_path) and os.path.exists(bold_path):
+                _font_cache[key] = {
+                    '': _build_font_subset(regular_path),
+                    'B': _build_font_subset(bold_path)
+                }
+                break
+    return _font_cache[key]
+
+class MEDDICPDFGenerator:
+    def __init__(self, font_candidates=EXPORT_CONFIG["pdf_font_candidates"]):
+        """Générateur de PDF pour les fiches MEDDIC"""
+        self.font_files = load_pdf_fonts(font_candidates)
+        # Sans police Unicode, repli sur la police de base Helvetica (latin-1)
+        self.font_family = 'MEDDICSans' if self.font_files else 'helvetica'
+
+    def new_document(self):
+        """Crée un document FPDF avec la police du générateur"""
+        pdf = FPDF()
+        if self.font_files:
+            for style, font_path in self.font_files.items():
+                pdf.add_font(self.font_family, style, font_path)
+        return pdf
+
+    def _text(self, value):
+        """Texte affichable : valeurs manquantes vides, latin-1 pour une police de base"""
+        text = str(value) if is_filled(value) else ''
+        if not self.font_files:
+            for character, replacement in LATIN1_REPLACEMENTS.items():
+                text = text.replace(character, replacement)
+            text = text.encode('latin-1', 'replace').decode('latin-1')
+        return text
+
+    def _line(self, pdf, height, text, style='', size=10, align='L'):
+        """Ligne de texte (titres, informations générales)"""
+        pdf.set_font(self.font_family, style, size)
+        pdf.cell(0, height, self._text(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align=align)
+
+    def _wrap(self, pdf, text):
+        """
+        Découpe un texte en lignes tenant dans la largeur utile de la page
+
+        Le découpage suit la largeur réelle des mots dans la police courante.
+        FPDF.multi_cell recalcule la largeur de la ligne entière à chaque
+        caractère, ce qui devient coûteux sur les longues notes : ici chaque mot
+        n'est mesuré qu'une fois.
+
+        Args:
+            pdf (FPDF): Document, avec la police du texte déjà sélectionnée
+            text (str): Texte à découper (les retours à la ligne sont conservés)
+
+        Returns:
+            list: Lignes à écrire
+        """
+        max_width = pdf.epw - 2 * pdf.c_margin
+        space_width = pdf.get_string_width(' ')
+        word_widths = {}
+        lines = []
+
+        for paragraph in text.split('\n'):
+            current_words = []
+            current_width = 0
+            for word in paragraph.split(' '):
+                if word not in word_widths:
+                    word_widths[word] = pdf.get_string_width(word)
+                width = word_widths[word]
+
+                # Mot plus large qu'une ligne : coupé caractère par caractère
+                if width > max_width:
+                    if current_words:
+                        lines.append(' '.join(current_words))
+                        current_words, current_width = [], 0
+                    chunk = ''
+                    for character in word:
+                        if pdf.get_string_width(chunk + character) > max_width:
+                            lines.append(chunk)
+                            chunk = ''
+                        chunk += character
+                    word, width = chunk, pdf.get_string_width(chunk)
+
+                if current_words and current_width + space_width + width > max_width:
+                    lines.append(' '.join(current_words))
+                    current_words, current_width = [], 0
+                current_width += width + (space_width if current_words else 0)
+                current_words.append(word)
+            lines.append(' '.join(current_words))
+        return lines
+
+    @timed("pdf")
+    def render_fiche(self, pdf, fiche_data, section=False):
+        """
+        Dessine une fiche MEDDIC sur une nouvelle page du document
+
+        Args:
+            pdf (FPDF): Document créé par new_document
+            fiche_data (dict): Données de la fiche
+            section (bool): Ajoute la fiche au sommaire du document
+        """
+        pdf.add_page()
+        if section:
+            pdf.start_section(self._text(f'{fiche_data["company"]} - {fiche_data["client_name"]}'))
+
+        # Titre
+        self._line(pdf, 10, f'Fiche MEDDIC - {self._text(fiche_data["company"])}', 'B', 16, 'C')
+        pdf.ln(10)
+
+        # Informations générales
+        self._line(pdf, 8, 'Informations Générales', 'B', 12)
+        self._line(pdf, 6, f'Client: {self._text(fiche_data["client_name"])}')
+        self._line(pdf, 6, f'Entreprise: {self._text(fiche_data["company"])}')
+        self._line(pdf, 6, f'Commercial: {self._text(fiche_data.get("commercial"))}')
+        self._line(pdf, 6, f'Date RDV: {self._text(fiche_data.get("meeting_date"))}')
+        pdf.ln(5)
+
+        # MEDDIC
+        sections = [
+            ('Metrics', fiche_data.get('metrics', '')),
+            ('Economic Buyer', fiche_data.get('economic_buyer', '')),
+            ('Decision Criteria', fiche_data.get('decision_criteria', '')),
+            ('Decision Process', fiche_data.get('decision_process', '')),
+            ('Identify Pain', fiche_data.get('identify_pain', '')),
+            ('Champion', fiche_data.get('champion', ''))
+        ]
+
+        for title, content in sections:
+            self._line(pdf, 8, title, 'B', 12)
+            pdf.set_font(self.font_family, '', 10)
+            text = self._text(content)
+            for line in self._wrap(pdf, text if text.strip() else '(Non renseigné)'):
+                pdf.cell(0, 5, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.ln(3)
+
+    @timed("pdf")
+    def generate_fiche_pdf(self, fiche_data):
+        """Génère un PDF pour une fiche MEDDIC"""
+        pdf = self.new_document()
+        self.render_fiche(pdf, fiche_data)
+        return _output_bytes(pdf)
+
+    @timed("pdf")
+    def generate_report_pdf(self, fiches, title="Rapport MEDDIC"):
+        """
+        Génère un rapport unique regroupant plusieurs fiches, avec sommaire
+
+        Args:
+            fiches (iterable): Fiches (dict) dans l'ordre du rapport
+            title (str): Titre de la page de garde
+
+        Returns:
+            bytes: Contenu du PDF
+        """
+        pdf = self.new_document()
+        pdf.add_page()
+        pdf.ln(60)
+        self._line(pdf, 12, title, 'B', 20, 'C')
+        self._line(pdf, 8, f'Généré le {datetime.now().strftime("%d/%m/%Y %H:%M")}', '', 12, 'C')
+
+        # Sommaire rempli en fin de rendu, sur autant de pages que nécessaire
+        pdf.add_page()
+        pdf.set_font(self.font_family, '', 10)
+        pdf.insert_toc_placeholder(TableOfContents().render_toc, allow_extra_pages=True)
+
+        for fiche_data in fiches:
+            self.render_fiche(pdf, fiche_data, section=True)
+        return _output_bytes(pdf)
+
+def _output_bytes(pdf):
+    """Contenu du document, en bytes pour Streamlit"""
+    pdf_bytes = pdf.output()
+    if isinstance(pdf_bytes, bytearray):
+        pdf_bytes = bytes(pdf_bytes)
+    return pdf_bytes
+
+# Générateur et cache propres à chaque processus du pool
+_worker_generator = None
+_worker_cache = None
+
+def render_fiche_file(fiche_data):
+    """
+    Rend le PDF d'une fiche dans un processus du pool
+
+    Point d'entrée des processus : il n'importe que ce module et output_cache
+    (qui ne dépend que de config, utils et pdf_generator), jamais l'application.
+
+    Args:
+        fiche_data (dict): Données de la fiche
+
+    Returns:
+        tuple: (nom de fichier, contenu du PDF)
+    """
+    # Import local : output_cache dépend de ce module
+    from output_cache import OutputCache, get_fiche_pdf
+
+    global _worker_generator, _worker_cache
+    if _worker_generator is None:
+        _worker_generator = MEDDICPDFGenerator()
+        _worker_cache = OutputCache()
+    return get_fiche_pdf_filename(fiche_data), get_fiche_pdf(_worker_cache, _worker_generator, fiche_data)
+
+# Les processus du pool sont démarrés par spawn : un fork du serveur Streamlit
+# (multi-thread : pool SQLite, audit, sauvegardes, boucle Tornado) hériterait de
+# verrous potentiellement tenus par d'autres threads
+_spawn_context = multiprocessing.get_context("spawn")
+
+def _write_pdf_zip_parallel(fiches, archive, max_workers=None):
+    """
+    Ajoute à l'archive les PDF rendus par un pool de processus
+
+    Appelé uniquement dans le processus lancé par `python -m pdf_generator` :
+    son module __main__ est ce module, que spawn réimporte dans chaque processus
+    du pool, sans jamais réexécuter le script de l'application.
+
+    Returns:
+        int: Nombre de PDF écrits
+    """
+    count = 0
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_spawn_context) as executor:
+        pending = deque()
+        for fiche_data in fiches:
+            pending.append(executor.submit(render_fiche_file, fiche_data))
+            if len(pending) >= workers * 4:
+                archive.writestr(*pending.popleft().result())
+                count += 1
+        while pending:
+            archive.writestr(*pending.popleft().result())
+            count += 1
+    return count
+
+def _render_in_subprocess(fiches, fileobj, max_workers=None):
+    """
+    Fait écrire l'archive par un interpréteur séparé (`python -m pdf_generator`)
+
+    Les fiches lui sont transmises par un fichier JSON Lines temporaire, écrit au
+    fil de l'eau : la mémoire reste bornée quel que soit le nombre de fiches.
+
+    Returns:
+        int: Nombre de PDF écrits
+    """
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [module_dir, env.get("PYTHONPATH")]))
+
+    with tempfile.TemporaryDirectory(prefix="meddic_pdf_") as work_dir:
+        fiches_path = os.path.join(work_dir, "fiches.jsonl")
+        archive_path = os.path.join(work_dir, "fiches.zip")
+        count = 0
+        with open(fiches_path, "w", encoding="utf-8") as fiches_file:
+            for fiche_data in fiches:
+                fiches_file.write(json.dumps(fiche_data, ensure_ascii=False, default=str) + "\n")
+                count += 1
+
+        command = [sys.executable, "-m", "pdf_generator", fiches_path, archive_path]
+        if max_workers:
+            command += ["--workers", str(max_workers)]
+        # Le répertoire courant est conservé : le cache des PDF y est relatif
+        result = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            error = result.stderr.decode("utf-8", errors="replace").strip().splitlines()
+            raise RuntimeError(f"Échec du rendu des PDF: {error[-1] if error else result.returncode}")
+
+        with open(archive_path, "rb") as archive_file:
+            shutil.copyfileobj(archive_file, fileobj)
+    return count
+
+@timed("pdf")
+def write_pdf_zip(fiches, fileobj, max_workers=EXPORT_CONFIG["pdf_workers"],
+                  parallel_threshold=EXPORT_CONFIG["pdf_parallel_threshold"]):
+    """
+    Écrit une archive ZIP contenant un PDF par fiche
+
+    Au-delà de parallel_threshold fiches, le rendu est confié à un processus
+    `python -m pdf_generator` qui le répartit sur un pool de processus ; les PDF
+    sont ajoutés à l'archive dans l'ordre des fiches, avec un nombre borné de
+    rendus en attente pour ne pas charger toutes les fiches en mémoire.
+
+    Args:
+        fiches (iterable): Fiches (dict) à exporter
+        fileobj (file): Fichier binaire de destination
+        max_workers (int): Nombre de processus (None = nombre de CPU)
+        parallel_threshold (int): En dessous de ce nombre de fiches, rendu dans le
+            processus courant (le démarrage du pool coûterait plus qu'il ne rapporte)
+
+    Returns:
+        int: Nombre de PDF écrits
+    """
+    fiches = iter(fiches)
+    first_fiches = []
+    for fiche_data in fiches:
+        first_fiches.append(fiche_data)
+        if len(first_fiches) >= parallel_threshold:
+            break
+
+    if len(first_fiches) >= parallel_threshold:
+        return _render_in_subprocess(chain(first_fiches, fiches), fileobj, max_workers)
+
+    # Les PDF sont déjà compressés : inutile de les recompresser dans l'archive
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for fiche_data in first_fiches:
+            archive.writestr(*render_fiche_file(fiche_data))
+    return len(first_fiches)
+
+def _read_fiches(path):
+    with open(path, encoding="utf-8") as fiches_file:
+        for line in fiches_file:
+            yield json.loads(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive ZIP des PDF de fiches MEDDIC")
+    parser.add_argument("fiches", help="Fiches à rendre (JSON Lines, une fiche par ligne)")
+    parser.add_argument("archive", help="Archive ZIP à écrire")
+    parser.add_argument("--workers", type=int, default=EXPORT_CONFIG["pdf_workers"],
+                        help="Processus de rendu (nombre de CPU par défaut)")
+    args = parser.parse_args()
+
+    # Module importé sous son nom : les tâches du pool référencent pdf_generator.render_fiche_file
+    # et non __main__.render_fiche_file (une seconde copie du module dans chaque processus)
+    import pdf_generator
+
+    with zipfile.ZipFile(args.archive, 'w', compression=zipfile.ZIP_STORED) as archive:
+        pdf_generator._write_pdf_zip_parallel(_read_fiches(args.fiches), archive, args.workers)
+
+if __name__ == "__main__":
+    main()
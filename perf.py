@@ -0,0 +1,342 @@
+"""Instrumentation des chemins critiques : spans de durée agrégés par exécution et par page
+
+Les fonctions coûteuses (méthodes de MEDDICDatabase, scoring et statistiques de
+utils, construction des graphiques, rendu PDF) sont enveloppées par `timed` ou
+`instrument_class`. Tant que la collecte est désactivée, l'enveloppe se limite
+à un test ; une fois activée, chaque appel ajoute sa durée :
+
+- à l'exécution Streamlit en cours (`rerun`, une par exécution complète du
+  script), propre au thread de la session, sans verrou ;
+- aux totaux par page, fusionnés à la fin de l'exécution. Les appels hors
+  exécution complète (fragments, API, threads de fond) sont comptés sous la
+  page « - ».
+
+Les durées sont inclusives : un span qui en appelle d'autres compte aussi leur
+temps. Les totaux s'exportent en JSON ou au format texte de Prometheus.
+"""
+import cProfile
+import functools
+import inspect
+import io
+import json
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Import des modules locaux
+from config import *
+
+# Page des appels survenus hors d'une exécution complète du script
+NO_PAGE = "-"
+
+_enabled = PERF_CONFIG["enabled"]
+_lock = threading.Lock()
+_local = threading.local()
+
+# Totaux : (page, span) -> [appels, secondes, maximum], page -> [exécutions, secondes, maximum]
+_span_totals = {}
+_page_totals = {}
+_categories = {}
+_history = deque(maxlen=PERF_CONFIG["history_size"])
+
+def is_enabled():
+    return _enabled
+
+def set_enabled(enabled):
+    """Active ou désactive la collecte pour tout le processus"""
+    global _enabled
+    _enabled = bool(enabled)
+
+def reset():
+    """Efface les totaux et l'historique des exécutions"""
+    with _lock:
+        _span_totals.clear()
+        _page_totals.clear()
+        _history.clear()
+
+def _add(totals, key, duration):
+    stats = totals.get(key)
+    if stats is None:
+        totals[key] = [1, duration, duration]
+    else:
+        stats[0] += 1
+        stats[1] += duration
+        if duration > stats[2]:
+            stats[2] = duration
+
+class Rerun:
+    """Spans collectés pendant une exécution complète du script"""
+
+    def __init__(self, page):
+        self.page = page
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.duration = None
+        self.spans = {}
+        self.profile_text = None
+
+    def elapsed(self):
+        """Durée de l'exécution (en cours ou terminée), en secondes"""
+        return self.duration if self.duration is not None else time.perf_counter() - self.start
+
+    def by_category(self):
+        """Temps cumulé par catégorie (sql, scoring, plotly, pdf...)"""
+        totals = {}
+        for name, (_, duration, _) in self.spans.items():
+            category = _categories.get(name, "autre")
+            totals[category] = totals.get(category, 0) + duration
+        return totals
+
+    def to_dict(self):
+        return {
+            "page": self.page,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_ms": round(self.elapsed() * 1000, 3),
+            "spans": {
+                name: {"count": count, "total_ms": round(total * 1000, 3), "max_ms": round(maximum * 1000, 3)}
+                for name, (count, total, maximum) in self.spans.items()
+            }
+        }
+
+def record(name, duration):
+    """
+    Ajoute la durée d'un appel
+
+    Args:
+        name (str): Nom du span
+        duration (float): Durée en secondes
+    """
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None:
+        _add(rerun.spans, name, duration)
+        return
+    with _lock:
+        _add(_span_totals, (NO_PAGE, name), duration)
+
+def _register(name, category):
+    _categories[name] = category
+    return name
+
+@contextmanager
+def span(name, category="autre"):
+    """Mesure la durée d'un bloc de code"""
+    if not _enabled:
+        yield
+        return
+    _register(name, category)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+def timed(category="autre", name=None):
+    """
+    Décorateur qui mesure chaque appel d'une fonction
+
+    Les fonctions génératrices sont mesurées pendant leur itération (le temps
+    passé par l'appelant entre deux éléments n'est pas compté).
+
+    Args:
+        category (str): Catégorie du span (sql, scoring, plotly, pdf...)
+        name (str): Nom du span (module.fonction ou Classe.méthode par défaut)
+    """
+    def decorator(func):
+        qualname = getattr(func, "__qualname__", getattr(func, "__name__", repr(func)))
+        span_name = _register(name or (qualname if "." in qualname else f"{func.__module__}.{qualname}"), category)
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return (yield from func(*args, **kwargs))
+                generator = func(*args, **kwargs)
+                duration = 0.0
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        try:
+                            item = next(generator)
+                        except StopIteration as stop:
+                            duration += time.perf_counter() - start
+                            return stop.value
+                        duration += time.perf_counter() - start
+                        yield item
+                finally:
+                    generator.close()
+                    record(span_name, duration)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(span_name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def instrument_class(cls, category):
+    """Enveloppe toutes les méthodes publiques définies par une classe"""
+    for attribute, value in list(vars(cls).items()):
+        if not attribute.startswith("_") and inspect.isfunction(value):
+            setattr(cls, attribute, timed(category)(value))
+    return cls
+
+class instrumented:
+    """Module dont les fonctions sont mesurées à l'appel (ex : plotly.express)"""
+
+    def __init__(self, module, category):
+        self._module = module
+        self._category = category
+        self._wrappers = {}
+
+    def __getattr__(self, attribute):
+        value = getattr(self._module, attribute)
+        if not callable(value) or attribute.startswith("_"):
+            return value
+        wrapper = self._wrappers.get(attribute)
+        if wrapper is None:
+            wrapper = timed(self._category, f"{self._module.__name__}.{attribute}")(value)
+            self._wrappers[attribute] = wrapper
+        return wrapper
+
+@contextmanager
+def rerun(page=NO_PAGE, profile=False):
+    """
+    Délimite une exécution complète du script Streamlit
+
+    Args:
+        page (str): Page affichée (modifiable via l'objet renvoyé)
+        profile (bool): Capture un profil cProfile de l'exécution
+
+    Yields:
+        Rerun: Exécution en cours
+    """
+    current = Rerun(page)
+    profiler = None
+    if profile:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Un autre profileur est déjà actif dans ce thread
+            profiler = None
+
+    _local.rerun = current
+    try:
+        yield current
+    finally:
+        _local.rerun = None
+        current.duration = time.perf_counter() - current.start
+        if profiler is not None:
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PERF_CONFIG["profile_lines"])
+            current.profile_text = output.getvalue()
+        if _enabled:
+            with _lock:
+                for name, (count, total, maximum) in current.spans.items():
+                    stats = _span_totals.setdefault((current.page, name), [0, 0.0, 0.0])
+                    stats[0] += count
+                    stats[1] += total
+                    stats[2] = max(stats[2], maximum)
+                _add(_page_totals, current.page, current.duration)
+                _history.append(current)
+
+def get_span_totals():
+    """
+    Totaux par page et par span
+
+    Returns:
+        list: Dictionnaires (page, span, category, count, total_ms, max_ms), les plus coûteux d'abord
+    """
+    with _lock:
+        items = list(_span_totals.items())
+    rows = [
+        {"page": page, "span": name, "category": _categories.get(name, "autre"), "count": count,
+         "total_ms": round(total * 1000, 3), "max_ms": round(maximum * 1000, 3)}
+        for (page, name), (count, total, maximum) in items
+    ]
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+def get_page_totals():
+    """
+    Durée des exécutions complètes par page
+
+    Returns:
+        list: Dictionnaires (page, reruns, avg_ms, max_ms)
+    """
+    with _lock:
+        items = list(_page_totals.items())
+    return [
+        {"page": page, "reruns": count, "avg_ms": round(total / count * 1000, 3), "max_ms": round(maximum * 1000, 3)}
+        for page, (count, total, maximum) in sorted(items, key=lambda item: item[1][1], reverse=True)
+    ]
+
+def get_history():
+    """Dernières exécutions complètes, de la plus ancienne à la plus récente"""
+    with _lock:
+        return list(_history)
+
+def to_json():
+    """Totaux et historique récent au format JSON"""
+    return json.dumps({
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "pages": get_page_totals(),
+        "spans": get_span_totals(),
+        "reruns": [item.to_dict() for item in get_history()]
+    }, ensure_ascii=False, indent=2)
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def to_prometheus():
+    """Totaux au format texte d'exposition Prometheus"""
+    lines = [
+        "# HELP meddic_span_calls_total Appels mesurés par page et par span",
+        "# TYPE meddic_span_calls_total counter",
+    ]
+    spans = get_span_totals()
+    for row in spans:
+        labels = f'page="{_label(row["page"])}",span="{_label(row["span"])}",category="{_label(row["category"])}"'
+        lines.append(f"meddic_span_calls_total{{{labels}}} {row['count']}")
+    lines += [
+        "# HELP meddic_span_seconds_total Durée cumulée par page et par span",
+        "# TYPE meddic_span_seconds_total counter",
+    ]
+    for row in spans:
+        labels = f'page="{_label(row["page"])}",span="{_label(row["span"])}",category="{_label(row["category"])}"'
+        lines.append(f"meddic_span_seconds_total{{{labels}}} {row['total_ms'] / 1000:.6f}")
+    lines += [
+        "# HELP meddic_reruns_total Exécutions complètes du script par page",
+        "# TYPE meddic_reruns_total counter",
+    ]
+    pages = get_page_totals()
+    for row in pages:
+        lines.append(f'meddic_reruns_total{{page="{_label(row["page"])}"}} {row["reruns"]}')
+    lines += [
+        "# HELP meddic_rerun_seconds_total Durée cumulée des exécutions complètes par page",
+        "# TYPE meddic_rerun_seconds_total counter",
+    ]
+    for row in pages:
+        total_seconds = row["avg_ms"] * row["reruns"] / 1000
+        lines.append(f'meddic_rerun_seconds_total{{page="{_label(row["page"])}"}} {total_seconds:.6f}')
+    return "\n".join(lines) + "\n"
+
+def dump(path):
+    """
+    Écrit les mesures dans un fichier (Prometheus si l'extension est .prom ou .txt, JSON sinon)
+
+    Args:
+        path (str): Chemin du fichier
+    """
+    content = to_prometheus() if path.endswith((".prom", ".txt")) else to_json()
+    with open(path, "w", encoding="utf-8") as output:
+        output.write(content)
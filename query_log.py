@@ -0,0 +1,294 @@
+"""Statistiques par requête SQL et journal des requêtes lentes
+
+Les connexions du pool sont créées avec `TimedConnection` : chaque instruction
+est chronométrée, exécution et lecture des résultats comprises, puis agrégée
+sous sa forme normalisée (littéraux remplacés par ?, listes de paramètres
+réduites, espaces compactés). Les instructions qui dépassent
+DATABASE_CONFIG["slow_query_ms"] sont journalisées avec leur plan
+d'exécution (EXPLAIN QUERY PLAN) : un SCAN sur une grande table signale un
+index manquant pour un nouveau filtre.
+
+Une instruction est close lorsque tous ses résultats ont été lus, lorsque le
+curseur est fermé ou réutilisé, ou lorsqu'il est libéré. Le plan n'est capturé
+que pendant un appel de l'utilisateur du curseur, tant qu'il détient la
+connexion : jamais depuis le finaliseur, qui peut s'exécuter alors que la
+connexion a été rendue au pool. Le finaliseur ne prend pas non plus de verrou
+(le ramasse-miettes peut l'appeler dans une section déjà verrouillée) : il
+dépose l'instruction dans une file, intégrée aux totaux lors de l'agrégation
+suivante.
+
+Désactivé par défaut (coût Python sur chaque instruction) : MEDDIC_QUERY_LOG=1.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+# Import des modules locaux
+from config import *
+
+logger = logging.getLogger(__name__)
+
+# Instructions dont le plan d'exécution peut être demandé
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+# Requête normalisée -> [exécutions, secondes, maximum, lignes]
+_statements = {}
+_slow_queries = deque(maxlen=DATABASE_CONFIG["slow_query_history"])
+# Instructions closes par le finaliseur, pas encore agrégées : (sql, secondes, lignes, plan)
+_deferred = deque()
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """
+    Forme normalisée d'une requête, commune à toutes ses valeurs de paramètres
+
+    Args:
+        sql (str): Texte de la requête
+
+    Returns:
+        str: Requête normalisée
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    return _PARAMETER_LIST.sub("(?, ...)", sql)
+
+def explain_query_plan(conn, sql, parameters=()):
+    """
+    Plan d'exécution d'une requête, indenté selon l'arbre de SQLite
+
+    Returns:
+        str: Plan (une étape par ligne), ou None si la requête ne s'y prête pas
+    """
+    if not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    try:
+        # Curseur de base : le plan n'est ni chronométré ni journalisé
+        rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    except sqlite3.Error as e:
+        return f"(plan indisponible : {e})"
+    depths = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        lines.append(f"{'  ' * depths[node_id]}{detail}")
+    return "\n".join(lines)
+
+def _is_slow(duration):
+    return duration * 1000 >= DATABASE_CONFIG["slow_query_ms"]
+
+def _aggregate(sql, duration, rows, plan, slow):
+    """Ajoute une instruction aux totaux (verrou détenu) et l'ajoute à slow si elle est lente"""
+    key = normalize_sql(sql)
+    stats = _statements.get(key)
+    if stats is None:
+        _statements[key] = [1, duration, duration, rows]
+    else:
+        stats[0] += 1
+        stats[1] += duration
+        stats[3] += rows
+        if duration > stats[2]:
+            stats[2] = duration
+
+    if _is_slow(duration):
+        query = {
+            "at": datetime.now().isoformat(timespec="seconds"), "sql": key,
+            "duration_ms": round(duration * 1000, 3), "rows": rows, "plan": plan or None
+        }
+        _slow_queries.append(query)
+        slow.append(query)
+
+def _drain_deferred(slow):
+    """Agrège les instructions déposées par le finaliseur (verrou détenu)"""
+    while True:
+        try:
+            item = _deferred.popleft()
+        except IndexError:
+            return
+        _aggregate(*item, slow)
+
+def _log_slow(slow):
+    # Hors du verrou : les handlers de logging peuvent être lents
+    for query in slow:
+        logger.warning("Requête lente (%.1f ms, %d ligne(s)) : %s%s", query["duration_ms"], query["rows"],
+                       query["sql"], f"\n{query['plan']}" if query["plan"] else "")
+
+def _record(sql, duration, rows, plan=None):
+    """Agrège une instruction terminée et la journalise si elle est lente"""
+    slow = []
+    with _lock:
+        _drain_deferred(slow)
+        _aggregate(sql, duration, rows, plan, slow)
+    _log_slow(slow)
+
+class TimedCursor(sqlite3.Cursor):
+    """Curseur qui chronomètre l'exécution et la lecture de chaque instruction"""
+
+    # Instruction en cours de lecture : [sql, paramètres, secondes, lignes, plan]
+    _pending = None
+
+    def _capture_plan(self):
+        """Capture le plan d'une instruction lente (appelé par le détenteur de la connexion)"""
+        pending = self._pending
+        if pending is not None and pending[4] is None and _is_slow(pending[2]):
+            # Chaîne vide : plan non applicable (PRAGMA, DDL...), pas de nouvelle tentative
+            pending[4] = explain_query_plan(self.connection, pending[0], pending[1]) or ""
+
+    def _finish(self, explain=True):
+        if explain:
+            self._capture_plan()
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            sql, _, duration, rows, plan = pending
+            _record(sql, duration, rows, plan)
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self._pending = [sql, parameters, time.perf_counter() - start, max(self.rowcount, 0), None]
+        # Pas de résultats à lire (écriture, PRAGMA, BEGIN...) : instruction terminée
+        if self.description is None:
+            self._finish()
+        else:
+            self._capture_plan()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        # Le plan dépend de chaque jeu de paramètres : il n'est pas capturé
+        _record(sql, time.perf_counter() - start, max(self.rowcount, 0))
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            if row is None:
+                self._finish()
+            else:
+                pending[3] += 1
+                # Le curseur peut n'être clos que par le finaliseur (conn.execute(...).fetchone())
+                self._capture_plan()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            pending[3] += len(rows)
+            if len(rows) < size:
+                self._finish()
+            else:
+                self._capture_plan()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            pending[3] += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            if self._pending is not None:
+                self._pending[2] += time.perf_counter() - start
+                self._finish()
+            raise
+        if self._pending is not None:
+            self._pending[2] += time.perf_counter() - start
+            self._pending[3] += 1
+            self._capture_plan()
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Curseurs temporaires (conn.execute(...).fetchone()) : clos à leur libération.
+        # La connexion peut déjà servir à un autre thread : durée seulement, sans requête.
+        # Sans verrou : deque.append est atomique, l'agrégation se fera plus tard
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            sql, _, duration, rows, plan = pending
+            _deferred.append((sql, duration, rows, plan))
+
+class TimedConnection(sqlite3.Connection):
+    """Connexion dont toutes les instructions passent par TimedCursor"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute n'appelle pas cursor() : raccourcis redéfinis
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def get_top_statements(limit=10, order_by="total_ms"):
+    """
+    Requêtes normalisées les plus coûteuses
+
+    Args:
+        limit (int): Nombre de requêtes renvoyées
+        order_by (str): Critère de tri (total_ms, count, avg_ms, max_ms ou rows)
+
+    Returns:
+        list: Dictionnaires (sql, count, total_ms, avg_ms, max_ms, rows)
+    """
+    slow = []
+    with _lock:
+        _drain_deferred(slow)
+        items = [(key, list(stats)) for key, stats in _statements.items()]
+    _log_slow(slow)
+    statements = [
+        {"sql": key, "count": count, "total_ms": round(total * 1000, 3),
+         "avg_ms": round(total / count * 1000, 3), "max_ms": round(maximum * 1000, 3), "rows": rows}
+        for key, (count, total, maximum, rows) in items
+    ]
+    return sorted(statements, key=lambda item: item[order_by], reverse=True)[:limit]
+
+def get_slow_queries():
+    """Dernières requêtes lentes avec leur plan, de la plus récente à la plus ancienne"""
+    slow = []
+    with _lock:
+        _drain_deferred(slow)
+        queries = list(reversed(_slow_queries))
+    _log_slow(slow)
+    return queries
+
+def reset():
+    """Efface les statistiques et le journal des requêtes lentes"""
+    with _lock:
+        _deferred.clear()
+        _statements.clear()
+        _slow_queries.clear()
@@ -0,0 +1,443 @@
+"""Générateur de bases MEDDIC synthétiques pour les tests de charge et de volumétrie
+
+Les fiches ressemblent à une base de production : quelques entreprises et
+commerciaux concentrent la plupart des fiches (distribution de Zipf), les
+champs MEDDIC contiennent du texte en français de longueur variable et sont
+d'autant plus souvent renseignés que l'opportunité est avancée, et l'historique
+s'étale sur plusieurs années avec les entrées d'audit correspondantes.
+
+La génération est déterministe : une même graine, un même nombre de fiches et
+une même date de fin produisent exactement la même base. Les lignes sont
+écrites directement dans le schéma par lots (executemany) ; les triggers FTS et
+de version des données sont suspendus pendant le chargement, puis l'index plein
+texte est reconstruit en une fois.
+
+Utilisation :
+    python synthetic_data.py synthetic.db --count 1000000
+    python synthetic_data.py synthetic.db --count 50000 --seed 7 --years 5 --end-date 2024-12-31
+"""
+import argparse
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+from string import Formatter
+
+import pandas as pd
+
+# Import des modules locaux
+from config import *
+from utils import get_priority_levels, get_completion_frame
+from migrations import (
+    apply_migrations, create_fts_triggers, drop_fts_triggers, rebuild_fts_index,
+    create_data_version_triggers, drop_data_version_triggers, bump_data_version
+)
+
+FIRST_NAMES = [
+    "Jean", "Marie", "Pierre", "Sophie", "Nicolas", "Isabelle", "Thomas", "Nathalie",
+    "Julien", "Céline", "Laurent", "Claire", "François", "Hélène", "Antoine", "Camille",
+    "Olivier", "Élodie", "Mathieu", "Aurélie", "Stéphane", "Julie", "Sébastien", "Anne"
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand",
+    "Leroy", "Moreau", "Simon", "Laurent", "Lefèvre", "Michel", "Garcia", "David",
+    "Bertrand", "Roux", "Vincent", "Fournier", "Morel", "Girard", "André", "Mercier"
+]
+COMPANY_ROOTS = [
+    "Axiome", "Batigest", "Cerulis", "Dynamis", "Éolia", "Ferrovial", "Galenis", "Horizon",
+    "Ingenia", "Jurisco", "Kerys", "Lumen", "Medalis", "Novatek", "Optimum", "Primea",
+    "Qualis", "Rhéa", "Sodexa", "Techlane", "Urbanis", "Valoris", "Wattéo", "Xylem"
+]
+COMPANY_SECTORS = [
+    "Industrie", "Logistique", "Santé", "Énergie", "Distribution", "Conseil",
+    "Assurances", "Banque", "Immobilier", "Agroalimentaire", "Télécom", "Services"
+]
+LEGAL_FORMS = ["SA", "SAS", "SARL", "Groupe", "SE"]
+
+# Phrases types par champ ; les marqueurs sont remplacés à la génération
+FIELD_PHRASES = {
+    "metrics": [
+        "Objectif de réduction des coûts opérationnels de {pct}% sur {months} mois.",
+        "Gain de productivité attendu d'environ {pct}% pour les équipes terrain.",
+        "Économies estimées à {amount}k€ par an après déploiement.",
+        "ROI visé sous {months} mois, validé avec la direction financière.",
+        "Réduire le délai de traitement des commandes de {days} jours à {days2} jours.",
+        "Diminuer le taux d'erreur de saisie de {pct}% grâce à l'automatisation.",
+        "Le client mesure aujourd'hui {amount} dossiers traités par mois.",
+    ],
+    "economic_buyer": [
+        "{person}, directeur financier, valide les budgets supérieurs à {amount}k€.",
+        "La décision finale revient à {person} (DG) après avis du comité de direction.",
+        "{person}, DSI, dispose du budget mais doit obtenir l'accord des achats.",
+        "Budget porté par {person}, directrice des opérations.",
+        "Rencontre avec {person} prévue en {month} pour présenter le business case.",
+        "Pas encore d'accès direct au décideur économique, passage obligé par les achats.",
+    ],
+    "decision_criteria": [
+        "Critères principaux : prix, intégration avec SAP et qualité du support.",
+        "Sécurité des données et hébergement en France exigés par la conformité.",
+        "Le client compare trois solutions sur le coût total de possession à {years} ans.",
+        "Références dans le secteur {sector} demandées avant toute décision.",
+        "Délai de mise en œuvre inférieur à {months} mois impératif.",
+        "Ergonomie et adoption par les utilisateurs jugées déterminantes.",
+        "Support 24/7 et engagement de niveau de service contractuel.",
+    ],
+    "decision_process": [
+        "Validation technique par la DSI puis passage en comité d'investissement en {month}.",
+        "Appel d'offres formel avec grille de notation, réponse attendue sous {days} jours.",
+        "Pilote de {months} mois sur un site avant généralisation.",
+        "Trois étapes : atelier métier, démonstration, négociation avec les achats.",
+        "Signature par {person} après accord du service juridique.",
+        "Le comité de pilotage se réunit tous les mois, prochaine session en {month}.",
+    ],
+    "identify_pain": [
+        "Processus manuels sources d'erreurs et de retards de facturation.",
+        "Outil actuel en fin de support, risque de rupture de service.",
+        "Perte de {amount}k€ par an liée aux litiges clients.",
+        "Manque de visibilité sur le pipeline commercial et les prévisions.",
+        "Turnover élevé dans l'équipe support, formation trop longue.",
+        "Non-conformité relevée lors du dernier audit, correction exigée sous {months} mois.",
+        "Délais de traitement de {days} jours jugés inacceptables par les clients.",
+    ],
+    "champion": [
+        "{person}, responsable du projet, défend activement notre solution en interne.",
+        "{person} a déjà utilisé notre offre chez un précédent employeur.",
+        "Soutien de {person}, chef de service, mais influence limitée sur le budget.",
+        "Champion identifié : {person}, très impliqué dans la rédaction du cahier des charges.",
+        "Pas encore de champion clairement identifié.",
+    ],
+    "notes": [
+        "Relance prévue en {month}.",
+        "Démonstration très bien accueillie par les utilisateurs.",
+        "Concurrent déjà en place sur une filiale.",
+        "Envoyer la proposition commerciale révisée avant fin {month}.",
+        "Le client souhaite une remise pour un engagement sur {years} ans.",
+        "Atelier de cadrage organisé avec {person}.",
+    ],
+}
+
+MONTHS = [
+    "janvier", "février", "mars", "avril", "mai", "juin",
+    "juillet", "août", "septembre", "octobre", "novembre", "décembre"
+]
+
+# Répartition des statuts : fiches récentes (moins de 6 mois) et plus anciennes
+STATUS_WEIGHTS_RECENT = {
+    "En cours": 45, "Qualifié": 20, "Non qualifié": 8,
+    "En attente": 15, "Fermé - Gagné": 5, "Fermé - Perdu": 7
+}
+STATUS_WEIGHTS_OLD = {
+    "En cours": 12, "Qualifié": 10, "Non qualifié": 15,
+    "En attente": 13, "Fermé - Gagné": 22, "Fermé - Perdu": 28
+}
+
+# Probabilité moyenne qu'un champ MEDDIC soit renseigné selon le statut
+FILL_RATES = {
+    "En cours": 0.6, "Qualifié": 0.9, "Non qualifié": 0.3,
+    "En attente": 0.5, "Fermé - Gagné": 0.95, "Fermé - Perdu": 0.55
+}
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Bornes des marqueurs numériques des phrases
+PLACEHOLDER_RANGES = {
+    'pct': (5, 45), 'months': (3, 24), 'amount': (10, 900),
+    'days': (10, 60), 'days2': (1, 9), 'years': (2, 5)
+}
+
+# Marqueurs utilisés par chaque phrase, pour ne tirer que les valeurs nécessaires
+PHRASE_KEYS = {
+    field: [(phrase, [name for _, name, _, _ in Formatter().parse(phrase) if name]) for phrase in phrases]
+    for field, phrases in FIELD_PHRASES.items()
+}
+
+def _zipf_cum_weights(count, exponent=1.1):
+    """Poids cumulés d'une distribution de Zipf (le premier élément est le plus fréquent)"""
+    return list(accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+class SyntheticFicheGenerator:
+    """Générateur déterministe de fiches MEDDIC réalistes"""
+
+    def __init__(self, seed=42, count=10000, years=3, end_date=None):
+        """
+        Args:
+            seed (int): Graine du générateur aléatoire
+            count (int): Nombre de fiches prévu (dimensionne les listes d'entreprises et de commerciaux)
+            years (int): Profondeur de l'historique
+            end_date (datetime): Date de la fiche la plus récente (maintenant par défaut)
+        """
+        self.rng = random.Random(seed)
+        self.end_date = (end_date or datetime.now()).replace(microsecond=0)
+        self.span_seconds = int(years * 365.25 * 24 * 3600)
+
+        # Une entreprise pour environ 40 fiches, un commercial pour environ 500
+        self.companies = self._make_companies(max(count // 40, 20))
+        self.company_weights = _zipf_cum_weights(len(self.companies))
+        self.commercials = self._unique_people(min(max(count // 500, 5), 300))
+        self.commercial_weights = _zipf_cum_weights(len(self.commercials), exponent=0.8)
+
+        self.statuses = list(MEDDIC_STATUS)
+        self.recent_weights = list(accumulate(STATUS_WEIGHTS_RECENT.get(status, 1) for status in self.statuses))
+        self.old_weights = list(accumulate(STATUS_WEIGHTS_OLD.get(status, 1) for status in self.statuses))
+
+    def _person(self):
+        return f"{FIRST_NAMES[self._int(0, len(FIRST_NAMES) - 1)]} {LAST_NAMES[self._int(0, len(LAST_NAMES) - 1)]}"
+
+    def _unique_people(self, count):
+        people = []
+        seen = set()
+        while len(people) < count:
+            person = self._person()
+            if person in seen:
+                person = f"{person} {len(people)}"
+            seen.add(person)
+            people.append(person)
+        return people
+
+    def _make_companies(self, count):
+        companies = []
+        seen = set()
+        while len(companies) < count:
+            name = f"{self.rng.choice(COMPANY_ROOTS)} {self.rng.choice(COMPANY_SECTORS)} {self.rng.choice(LEGAL_FORMS)}"
+            if name in seen:
+                name = f"{name} {len(companies)}"
+            seen.add(name)
+            companies.append(name)
+        return companies
+
+    def _int(self, low, high):
+        """Entier entre low et high inclus (plus rapide que randint)"""
+        return low + int(self.rng.random() * (high - low + 1))
+
+    def _value(self, name):
+        """Valeur aléatoire d'un marqueur de phrase"""
+        if name == 'person':
+            return self._person()
+        if name == 'month':
+            return MONTHS[self._int(0, 11)]
+        if name == 'sector':
+            return COMPANY_SECTORS[self._int(0, len(COMPANY_SECTORS) - 1)]
+        low, high = PLACEHOLDER_RANGES[name]
+        return self._int(low, high)
+
+    def text(self, field):
+        """Texte libre d'un champ : quelques phrases, parfois un long compte rendu"""
+        phrases = PHRASE_KEYS[field]
+        sentences = []
+        for _ in range(1 + min(int(self.rng.expovariate(0.5)), 14)):
+            phrase, keys = phrases[self._int(0, len(phrases) - 1)]
+            sentences.append(phrase.format(**{key: self._value(key) for key in keys}) if keys else phrase)
+        return ' '.join(sentences)
+
+    def fiche(self):
+        """
+        Génère une fiche
+
+        Returns:
+            dict: Champs saisis, plus created_at et updated_at
+        """
+        rng = self.rng
+
+        # Historique plus dense sur la période récente
+        age = int(self.span_seconds * rng.random() ** 1.5)
+        created_at = self.end_date - timedelta(seconds=age)
+        updated_at = created_at + timedelta(seconds=int(age * rng.random() ** 3))
+        meeting_date = min(created_at + timedelta(days=self._int(-10, 30)), self.end_date)
+
+        weights = self.recent_weights if age < 182 * 24 * 3600 else self.old_weights
+        status = rng.choices(self.statuses, cum_weights=weights)[0]
+
+        fiche = {
+            'client_name': self._person(),
+            'company': rng.choices(self.companies, cum_weights=self.company_weights)[0],
+            'meeting_date': meeting_date.strftime('%Y-%m-%d'),
+            'commercial': rng.choices(self.commercials, cum_weights=self.commercial_weights)[0],
+            'status': status,
+            'notes': self.text('notes') if rng.random() < 0.6 else '',
+            'created_at': created_at.strftime(TIMESTAMP_FORMAT),
+            'updated_at': updated_at.strftime(TIMESTAMP_FORMAT)
+        }
+
+        # Qualification partielle : maturité propre à chaque fiche autour du taux du statut
+        maturity = min(max(rng.gauss(FILL_RATES.get(status, 0.5), 0.15), 0), 1)
+        for field in REQUIRED_MEDDIC_FIELDS:
+            if rng.random() < maturity:
+                fiche[field] = self.text(field)
+            else:
+                # Vide depuis le formulaire, NULL depuis un import
+                fiche[field] = '' if rng.random() < 0.5 else None
+        return fiche
+
+    def audit_events(self, fiche_id, fiche):
+        """
+        Entrées d'audit d'une fiche : création puis modifications jusqu'à updated_at
+
+        Returns:
+            list: Tuples (fiche_id, action, field_changed, old_value, new_value, timestamp)
+        """
+        rng = self.rng
+        events = [(fiche_id, 'CREATE', None, None, None, fiche['created_at'])]
+        if fiche['updated_at'] == fiche['created_at']:
+            return events
+
+        created_at = datetime.fromisoformat(fiche['created_at'])
+        updated_at = datetime.fromisoformat(fiche['updated_at'])
+        span = int((updated_at - created_at).total_seconds())
+        timestamps = sorted(
+            created_at + timedelta(seconds=self._int(1, span))
+            for _ in range(min(int(rng.expovariate(0.6)), 8))
+        )
+        timestamps.append(updated_at)
+
+        filled = [field for field in REQUIRED_MEDDIC_FIELDS + ['notes'] if fiche[field]]
+        previous_status = self.statuses[0]
+        for index, timestamp in enumerate(timestamps):
+            last = index == len(timestamps) - 1
+            if last or not filled or rng.random() < 0.3:
+                new_status = fiche['status'] if last else rng.choice(self.statuses)
+                if new_status == previous_status and not last:
+                    continue
+                events.append((fiche_id, 'UPDATE', 'status', previous_status, new_status,
+                               timestamp.strftime(TIMESTAMP_FORMAT)))
+                previous_status = new_status
+            else:
+                field = rng.choice(filled)
+                events.append((fiche_id, 'UPDATE', field, '', fiche[field],
+                               timestamp.strftime(TIMESTAMP_FORMAT)))
+        return events
+
+    def batch(self, size):
+        """
+        Génère un lot de fiches avec leur priorité et leurs colonnes de complétude
+
+        Args:
+            size (int): Nombre de fiches
+
+        Returns:
+            DataFrame: Une colonne par colonne de meddic_fiches (hors id)
+        """
+        fiches_df = pd.DataFrame([self.fiche() for _ in range(size)])
+        fiches_df['priority'] = get_priority_levels(fiches_df, now=self.end_date)
+        return pd.concat([fiches_df, get_completion_frame(fiches_df)], axis=1)
+
+def populate_database(db_path, count, seed=42, years=3, end_date=None,
+                      batch_size=IMPORT_CONFIG["batch_size"], audit=True, progress=None):
+    """
+    Ajoute des fiches synthétiques dans une base (créée ou mise à niveau au besoin)
+
+    Args:
+        db_path (str): Chemin de la base SQLite
+        count (int): Nombre de fiches à générer
+        seed (int): Graine du générateur
+        years (int): Profondeur de l'historique
+        end_date (datetime): Date de la fiche la plus récente (maintenant par défaut)
+        batch_size (int): Fiches par transaction
+        audit (bool): Écrit aussi les entrées d'audit_log
+        progress (callable): Appelé avec le nombre de fiches écrites après chaque lot
+
+    Returns:
+        dict: Nombre de fiches et d'entrées d'audit écrites
+    """
+    generator = SyntheticFicheGenerator(seed, count, years, end_date)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        apply_migrations(conn)
+        conn.execute(f"PRAGMA journal_mode = {DATABASE_CONFIG['journal_mode']}")
+        # Une base en cours de génération peut être régénérée : pas de fsync par lot
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"PRAGMA cache_size = -{int(DATABASE_CONFIG['cache_size_kb'])}")
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='meddic_fiches_fts'"
+        ).fetchone() is not None
+
+        # Triggers suspendus : l'index FTS est reconstruit et la version incrémentée une seule fois
+        conn.execute("BEGIN IMMEDIATE")
+        drop_fts_triggers(conn)
+        drop_data_version_triggers(conn)
+        conn.execute("COMMIT")
+
+        written = 0
+        audit_rows = 0
+        try:
+            next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM meddic_fiches").fetchone()[0]
+            while written < count:
+                fiches_df = generator.batch(min(batch_size, count - written))
+                fiches_df.insert(0, 'id', range(next_id, next_id + len(fiches_df)))
+                columns = list(fiches_df.columns)
+                values = fiches_df.astype(object).where(fiches_df.notna(), None)
+
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(f"""
+                        INSERT INTO meddic_fiches ({', '.join(columns)})
+                        VALUES ({', '.join('?' * len(columns))})
+                    """, values.itertuples(index=False, name=None))
+
+                    if audit:
+                        events = []
+                        for fiche in values.to_dict('records'):
+                            events.extend(generator.audit_events(fiche['id'], fiche))
+                        conn.executemany("""
+                            INSERT INTO audit_log (fiche_id, action, field_changed, old_value, new_value, timestamp)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                        """, events)
+                        audit_rows += len(events)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+
+                next_id += len(fiches_df)
+                written += len(fiches_df)
+                if progress:
+                    progress(written)
+        finally:
+            # Remise en état même si le chargement est interrompu
+            conn.execute("BEGIN IMMEDIATE")
+            if has_fts:
+                rebuild_fts_index(conn)
+                create_fts_triggers(conn)
+            create_data_version_triggers(conn)
+            bump_data_version(conn)
+            conn.execute("COMMIT")
+
+        conn.execute("ANALYZE")
+        return {"fiches": written, "audit_rows": audit_rows}
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Génération de fiches MEDDIC synthétiques")
+    parser.add_argument("db", help="Base SQLite à remplir (créée si absente)")
+    parser.add_argument("--count", type=int, default=100000, help="Nombre de fiches")
+    parser.add_argument("--seed", type=int, default=42, help="Graine (même graine, même base)")
+    parser.add_argument("--years", type=int, default=3, help="Profondeur de l'historique")
+    parser.add_argument("--end-date", help="Date de la fiche la plus récente (AAAA-MM-JJ, aujourd'hui par défaut)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_CONFIG["batch_size"],
+                        help="Fiches par transaction")
+    parser.add_argument("--no-audit", action="store_true", help="Ne pas générer d'audit_log")
+    args = parser.parse_args()
+
+    end_date = None
+    if args.end_date:
+        try:
+            end_date = datetime.strptime(args.end_date, '%Y-%m-%d')
+        except ValueError:
+            parser.error(f"Date invalide: {args.end_date}")
+
+    start = time.perf_counter()
+
+    def progress(written):
+        elapsed = time.perf_counter() - start
+        print(f"\r{written}/{args.count} fiches ({written / elapsed:.0f}/s)", end="", flush=True)
+
+    report = populate_database(
+        args.db, args.count, seed=args.seed, years=args.years, end_date=end_date,
+        batch_size=args.batch_size, audit=not args.no_audit, progress=progress
+    )
+    print(f"\n{report['fiches']} fiche(s) et {report['audit_rows']} entrée(s) d'audit écrites "
+          f"en {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Tests des requêtes conditionnelles de l'API (ETag, If-None-Match, If-Match)"""
+import os
+import sys
+
+import pytest
+from starlette.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DATABASE_CONFIG
+from api import create_app
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(DATABASE_CONFIG, "backup_enabled", False)
+    with TestClient(create_app(str(tmp_path / "api.db"))) as test_client:
+        yield test_client
+
+def test_etag_changes_for_updates_within_the_same_second(client):
+    created = client.post("/fiches", json={"client_name": "Alice", "company": "ACME", "notes": "v1"})
+    assert created.status_code == 201
+    url = created.headers["location"]
+    first_etag = client.get(url).headers["etag"]
+
+    # Deux mises à jour successives : updated_at ne change pas forcément de seconde
+    second = client.put(url, json={"notes": "v2"})
+    third = client.put(url, json={"notes": "v3"})
+    assert second.status_code == third.status_code == 200
+    assert len({first_etag, second.headers["etag"], third.headers["etag"]}) == 3
+
+    # Un ETag périmé ne doit ni produire de 304, ni autoriser une écriture
+    stale = client.get(url, headers={"If-None-Match": second.headers["etag"]})
+    assert stale.status_code == 200
+    assert stale.json()["notes"] == "v3"
+
+    conflict = client.put(url, json={"notes": "v4"}, headers={"If-Match": second.headers["etag"]})
+    assert conflict.status_code == 412
+    assert client.get(url).json()["notes"] == "v3"
+
+    # L'ETag courant reste utilisable
+    assert client.get(url, headers={"If-None-Match": third.headers["etag"]}).status_code == 304
+    assert client.put(url, json={"notes": "v4"}, headers={"If-Match": third.headers["etag"]}).status_code == 200
+
+def test_put_accepts_a_fiche_returned_by_get(client):
+    url = client.post("/fiches", json={"client_name": "Bob", "company": "Initech"}).headers["location"]
+    current = client.get(url)
+
+    # Colonnes calculées par le serveur renvoyées telles quelles : ignorées
+    fiche = dict(current.json(), notes="relu puis modifié", completion_score=100, priority="Haute")
+    updated = client.put(url, json=fiche, headers={"If-Match": current.headers["etag"]})
+    assert updated.status_code == 200
+    assert updated.json()["notes"] == "relu puis modifié"
+    assert updated.json()["completion_score"] == current.json()["completion_score"]
+
+    assert client.put(url, json={"unknown_field": "x"}).status_code == 422
+
+def test_if_match_is_checked_in_the_update_transaction(client, monkeypatch):
+    url = client.post("/fiches", json={"client_name": "Carol", "company": "Globex"}).headers["location"]
+    etag = client.get(url).headers["etag"]
+    db = client.app.state.db
+    save_fiche = db.save_fiche
+
+    # Écriture concurrente entre la lecture de la fiche par le PUT et sa mise à jour
+    def save_after_concurrent_write(fiche_data, precondition=None):
+        concurrent = db.get_fiche_by_id(fiche_data['id'])
+        save_fiche(dict(concurrent, notes="écriture concurrente"))
+        return save_fiche(fiche_data, precondition)
+
+    monkeypatch.setattr(db, "save_fiche", save_after_concurrent_write)
+    assert client.put(url, json={"notes": "perdue"}, headers={"If-Match": etag}).status_code == 412
+    monkeypatch.undo()
+    assert client.get(url).json()["notes"] == "écriture concurrente"
+
+def test_if_match_uses_strong_comparison(client):
+    url = client.post("/fiches", json={"client_name": "Dan", "company": "Umbrella"}).headers["location"]
+    etag = client.get(url).headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.put(url, json={"notes": "x"}, headers={"If-Match": f"W/{etag}"}).status_code == 412
+    assert client.put(url, json={"notes": "x"}, headers={"If-Match": etag}).status_code == 200
@@ -1,11 +1,24 @@
-import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import sqlite3
 import json
 import hashlib
+import re
 from config import *
+from perf import timed
 
+def is_filled(value):
+    """Indique si une valeur est renseignée (ni nulle, ni NaN, ni vide)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return False
+    return bool(value) and bool(str(value).strip())
+
+def _filled_mask(values):
+    """Version vectorisée de is_filled pour une colonne de DataFrame"""
+    return values.notna() & values.astype(str).str.strip().ne('')
+
+@timed("scoring")
 def calculate_completion_score(fiche_data):
     """
     Calcule le score de complétude d'une fiche MEDDIC
@@ -20,11 +33,73 @@ def calculate_completion_score(fiche_data):
     total_fields = len(REQUIRED_MEDDIC_FIELDS)
     
     for field in REQUIRED_MEDDIC_FIELDS:
-        if field in fiche_data and fiche_data[field] and str(fiche_data[field]).strip():
+        if field in fiche_data and is_filled(fiche_data[field]):
             completed_fields += 1
     
     return (completed_fields / total_fields) * 100
 
+def get_completion_columns(fiche_data):
+    """
+    Calcule les colonnes de complétude persistées dans meddic_fiches
+    
+    Args:
+        fiche_data (dict): Données de la fiche MEDDIC
+        
+    Returns:
+        dict: Indicateur '<champ>_filled' (0/1) par champ MEDDIC et 'completion_score'
+    """
+    columns = {
+        f"{field}_filled": int(field in fiche_data and is_filled(fiche_data[field]))
+        for field in REQUIRED_MEDDIC_FIELDS
+    }
+    columns['completion_score'] = calculate_completion_score(fiche_data)
+    return columns
+
+@timed("scoring")
+def calculate_completion_scores(fiches_df):
+    """
+    Calcule le score de complétude de toutes les fiches d'un DataFrame
+    
+    Équivalent colonne par colonne de calculate_completion_score.
+    
+    Args:
+        fiches_df (DataFrame): DataFrame des fiches
+        
+    Returns:
+        Series: Score de complétude (0-100) de chaque fiche
+    """
+    completed_fields = pd.Series(0, index=fiches_df.index)
+    
+    for field in REQUIRED_MEDDIC_FIELDS:
+        if field in fiches_df.columns:
+            completed_fields += _filled_mask(fiches_df[field]).astype(int)
+    
+    return (completed_fields / len(REQUIRED_MEDDIC_FIELDS)) * 100
+
+@timed("scoring")
+def get_completion_frame(fiches_df):
+    """
+    Calcule les colonnes de complétude persistées pour toutes les fiches d'un DataFrame
+    
+    Équivalent colonne par colonne de get_completion_columns.
+    
+    Args:
+        fiches_df (DataFrame): DataFrame des fiches
+        
+    Returns:
+        DataFrame: Indicateurs '<champ>_filled' (0/1) et 'completion_score', même index
+    """
+    columns = {}
+    for field in REQUIRED_MEDDIC_FIELDS:
+        if field in fiches_df.columns:
+            columns[f"{field}_filled"] = _filled_mask(fiches_df[field]).astype(int)
+        else:
+            columns[f"{field}_filled"] = pd.Series(0, index=fiches_df.index)
+    
+    completion = pd.DataFrame(columns, index=fiches_df.index)
+    completion['completion_score'] = completion.sum(axis=1) / len(REQUIRED_MEDDIC_FIELDS) * 100
+    return completion
+
 def get_status_color(status):
     """
     Retourne la couleur associée à un statut
@@ -55,6 +130,7 @@ def format_date(date_str):
     except:
         return date_str
 
+@timed("scoring")
 def get_priority_level(fiche_data):
     """
     Détermine le niveau de priorité d'une fiche basé sur plusieurs critères
@@ -85,7 +161,8 @@ def get_priority_level(fiche_data):
         score += 1
     
     # Score basé sur la date de mise à jour
-    if fiche_data.get('updated_at'):
+    updated_at = fiche_data.get('updated_at')
+    if updated_at and not pd.isna(updated_at):
         try:
             last_update = datetime.strptime(fiche_data['updated_at'][:10], '%Y-%m-%d')
             days_since_update = (datetime.now() - last_update).days
@@ -106,6 +183,52 @@ def get_priority_level(fiche_data):
     else:
         return "Basse"
 
+@timed("scoring")
+def get_priority_levels(fiches_df, now=None):
+    """
+    Détermine le niveau de priorité de toutes les fiches d'un DataFrame
+    
+    Équivalent colonne par colonne de get_priority_level : les dates de mise à jour
+    sont analysées en une seule fois au lieu d'un strptime par ligne.
+    
+    Args:
+        fiches_df (DataFrame): DataFrame des fiches
+        now (datetime): Date de référence (maintenant par défaut)
+        
+    Returns:
+        Series: Niveau de priorité (Haute, Moyenne, Basse) de chaque fiche
+    """
+    if now is None:
+        now = datetime.now()
+    
+    # Score basé sur la complétude
+    completion = calculate_completion_scores(fiches_df)
+    score = np.select([completion >= 80, completion >= 50], [3, 2], 1)
+    
+    # Score basé sur le statut
+    if 'status' in fiches_df.columns:
+        status = fiches_df['status']
+        score += np.select([status == 'Qualifié', status == 'En cours'], [3, 2], 1)
+    else:
+        score += 1
+    
+    # Score basé sur la date de mise à jour
+    if 'updated_at' in fiches_df.columns:
+        updated_at = fiches_df['updated_at']
+        has_date = (updated_at.notna() & updated_at.astype(str).ne('')).to_numpy()
+        last_update = pd.to_datetime(updated_at.astype(str).str[:10], format='%Y-%m-%d', errors='coerce')
+        days_since_update = (pd.Timestamp(now) - last_update).dt.days
+        date_score = np.select(
+            [last_update.isna(), days_since_update <= 7, days_since_update <= 30],
+            [1, 3, 2],
+            1
+        )
+        score += np.where(has_date, date_score, 0)
+    
+    # Détermination du niveau de priorité
+    levels = np.select([score >= 8, score >= 6], ["Haute", "Moyenne"], "Basse")
+    return pd.Series(levels, index=fiches_df.index)
+
 def get_priority_color(priority):
     """
     Retourne la couleur associée à un niveau de priorité
@@ -123,6 +246,20 @@ def get_priority_color(priority):
     }
     return colors.get(priority, "#808080")
 
+# À incrémenter à chaque changement de generate_fiche_summary : invalide les résumés en cache
+SUMMARY_RENDER_VERSION = 2
+
+def _summary_value(fiche_data, field):
+    """
+    Valeur d'un champ affichée dans le résumé, vide si elle n'est pas renseignée
+
+    Les valeurs manquantes (absentes, None, NaN, vides) ont la même empreinte
+    dans le cache des résumés (get_fiche_content_hash) : elles s'affichent de même.
+    """
+    value = fiche_data.get(field)
+    return str(value) if is_filled(value) else ''
+
+@timed("scoring")
 def generate_fiche_summary(fiche_data):
     """
     Génère un résumé textuel d'une fiche MEDDIC
@@ -133,11 +270,11 @@ def generate_fiche_summary(fiche_data):
     Returns:
         str: Résumé formaté de la fiche
     """
-    summary = f"## Résumé MEDDIC - {fiche_data.get('company', 'N/A')}\n\n"
-    summary += f"**Client:** {fiche_data.get('client_name', 'N/A')}\n"
-    summary += f"**Commercial:** {fiche_data.get('commercial', 'N/A')}\n"
-    summary += f"**Date RDV:** {format_date(fiche_data.get('meeting_date', ''))}\n"
-    summary += f"**Statut:** {fiche_data.get('status', 'N/A')}\n\n"
+    summary = f"## Résumé MEDDIC - {_summary_value(fiche_data, 'company')}\n\n"
+    summary += f"**Client:** {_summary_value(fiche_data, 'client_name')}\n"
+    summary += f"**Commercial:** {_summary_value(fiche_data, 'commercial')}\n"
+    summary += f"**Date RDV:** {format_date(_summary_value(fiche_data, 'meeting_date'))}\n"
+    summary += f"**Statut:** {_summary_value(fiche_data, 'status')}\n\n"
     
     completion = calculate_completion_score(fiche_data)
     summary += f"**Score de complétude:** {completion:.0f}%\n\n"
@@ -154,16 +291,43 @@ def generate_fiche_summary(fiche_data):
     
     for title, content in meddic_sections:
         summary += f"### {title}\n"
-        if content and content.strip():
+        if is_filled(content):
             summary += f"{content}\n\n"
         else:
             summary += "*Non renseigné*\n\n"
     
-    if fiche_data.get('notes'):
+    if is_filled(fiche_data.get('notes')):
         summary += f"### 📝 NOTES\n{fiche_data['notes']}\n\n"
     
     return summary
 
+def get_fiche_content_hash(fiche_data, fields, salt=""):
+    """
+    Calcule l'empreinte du contenu d'une fiche pour les champs donnés
+    
+    Deux fiches dont ces champs sont identiques ont la même empreinte ; les
+    valeurs manquantes (None, NaN, vide) sont équivalentes.
+    
+    Args:
+        fiche_data (dict): Données de la fiche
+        fields (list): Champs qui déterminent le document produit
+        salt (str): Identifie le type et la version du document
+        
+    Returns:
+        str: Empreinte SHA-256 hexadécimale
+    """
+    values = [
+        str(fiche_data.get(field)) if is_filled(fiche_data.get(field)) else ''
+        for field in fields
+    ]
+    payload = json.dumps([salt, values], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def get_fiche_pdf_filename(fiche_data):
+    """Nom de fichier du PDF d'une fiche, sans caractères interdits dans un chemin"""
+    company = re.sub(r'[\\/:*?"<>|\s]+', '_', str(fiche_data['company'])).strip('_')
+    return f"MEDDIC_{company}_{fiche_data['id']}.pdf"
+
 def validate_fiche_data(fiche_data):
     """
     Valide les données d'une fiche MEDDIC
@@ -216,6 +380,9 @@ def backup_database(db_path, backup_dir="backups"):
     """
     Crée une sauvegarde de la base de données
     
+    La copie passe par l'API de backup SQLite (voir backup.py) : elle reste
+    cohérente même si l'application écrit pendant la sauvegarde.
+    
     Args:
         db_path (str): Chemin vers la base de données
         backup_dir (str): Répertoire de sauvegarde
@@ -223,19 +390,11 @@ def backup_database(db_path, backup_dir="backups"):
     Returns:
         str: Chemin vers le fichier de sauvegarde
     """
-    import shutil
-    import os
-    
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
-    
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_filename = f"meddic_backup_{timestamp}.db"
-    backup_path = os.path.join(backup_dir, backup_filename)
+    from backup import backup_database as online_backup
     
-    shutil.copy2(db_path, backup_path)
-    return backup_path
+    return online_backup(db_path, backup_dir)
 
+@timed("scoring")
 def search_fiches(fiches_df, search_term):
     """
     Recherche dans les fiches MEDDIC
@@ -257,14 +416,16 @@ def search_fiches(fiches_df, search_term):
                      'economic_buyer', 'decision_criteria', 'decision_process',
                      'identify_pain', 'champion', 'notes']
     
-    mask = pd.Series([False] * len(fiches_df))
+    mask = pd.Series(False, index=fiches_df.index)
     
     for col in search_columns:
         if col in fiches_df.columns:
-            mask |= fiches_df[col].astype(str).str.lower().str.contains(search_term, na=False)
+            # Recherche littérale : les caractères spéciaux ne sont pas interprétés comme regex
+            mask |= fiches_df[col].astype(str).str.lower().str.contains(search_term, na=False, regex=False)
     
     return fiches_df[mask]
 
+@timed("scoring")
 def get_statistics(fiches_df):
     """
     Calcule des statistiques sur les fiches MEDDIC
@@ -279,7 +440,7 @@ def get_statistics(fiches_df):
         return {}
     
     # Calcul des scores de complétude
-    completion_scores = fiches_df.apply(lambda row: calculate_completion_score(row), axis=1)
+    completion_scores = calculate_completion_scores(fiches_df)
     
     stats = {
         'total_fiches': len(fiches_df),
@@ -289,13 +450,12 @@ def get_statistics(fiches_df):
         'companies_count': fiches_df['company'].nunique(),
         'commercials_count': fiches_df['commercial'].nunique() if 'commercial' in fiches_df.columns else 0,
         'qualified_rate': (len(fiches_df[fiches_df['status'] == 'Qualifié']) / len(fiches_df)) * 100,
-        'avg_completion_by_status': fiches_df.groupby('status').apply(
-            lambda x: x.apply(lambda row: calculate_completion_score(row), axis=1).mean()
-        ).to_dict()
+        'avg_completion_by_status': completion_scores.groupby(fiches_df['status']).mean().to_dict()
     }
     
     return stats
 
+@timed("scoring")
 def generate_recommendations(fiche_data):
     """
     Génère des recommandations basées sur l'analyse de la fiche MEDDIC
@@ -316,16 +476,16 @@ def generate_recommendations(fiche_data):
         recommendations.append("🟡 Finaliser la qualification MEDDIC")
     
     # Recommandations spécifiques par champ
-    if not fiche_data.get('metrics') or not fiche_data['metrics'].strip():
+    if not is_filled(fiche_data.get('metrics')):
         recommendations.append("📊 Définir des métriques quantifiables avec le client")
     
-    if not fiche_data.get('economic_buyer') or not fiche_data['economic_buyer'].strip():
+    if not is_filled(fiche_data.get('economic_buyer')):
         recommendations.append("💰 Identifier et qualifier l'Economic Buyer")
     
-    if not fiche_data.get('champion') or not fiche_data['champion'].strip():
+    if not is_filled(fiche_data.get('champion')):
         recommendations.append("🤝 Développer un Champion interne")
     
-    if not fiche_data.get('decision_process') or not fiche_data['decision_process'].strip():
+    if not is_filled(fiche_data.get('decision_process')):
         recommendations.append("⚙️ Cartographier le processus de décision")
     
     # Recommandations basées sur le statut
@@ -341,9 +501,10 @@ class MEDDICReportGenerator:
     """Générateur de rapports MEDDIC avancés"""
     
     @staticmethod
-    def generate_executive_summary(fiches_df):
-        """Génère un résumé exécutif des activités MEDDIC"""
-        stats = get_statistics(fiches_df)
+    def generate_executive_summary(fiches_df=None, stats=None):
+        """Génère un résumé exécutif à partir des fiches ou de statistiques déjà calculées"""
+        if stats is None:
+            stats = get_statistics(fiches_df)
         
         summary = "# Résumé Exécutif MEDDIC\n\n"
         summary += f"## Vue d'ensemble\n"
@@ -0,0 +1 @@
+"""Pages de l'application Streamlit, importées à la demande par app.py"""
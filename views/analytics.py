@@ -0,0 +1,89 @@
+"""Page « Analytiques » : graphiques de suivi du pipeline"""
+from datetime import datetime
+
+import pandas as pd
+import plotly.express
+import streamlit as st
+
+# Import des modules locaux
+from config import *
+from utils import *
+from views.common import cached_read, plotly_chart
+from perf import instrumented
+
+# Construction des graphiques mesurée (panneau Performance)
+px = instrumented(plotly.express, "plotly")
+
+def show_analytics(db):
+    """Affiche les analytiques et statistiques"""
+    st.title("📈 Analytiques MEDDIC")
+    
+    fiches_df = cached_read(db, 'get_all_fiches', columns="summary")
+    
+    if fiches_df.empty:
+        st.info("Aucune donnée disponible pour les analytiques.")
+        return
+    
+    # Métriques globales
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        avg_completion = fiches_df['completion_score'].mean()
+        st.metric("Complétude Moyenne", f"{avg_completion:.1f}%")
+    
+    with col2:
+        qualified_rate = (len(fiches_df[fiches_df['status'] == 'Qualifié']) / len(fiches_df)) * 100
+        st.metric("Taux de Qualification", f"{qualified_rate:.1f}%")
+    
+    with col3:
+        complete_fiches = len(fiches_df[fiches_df['completion_score'] == 100])
+        st.metric("Fiches Complètes", complete_fiches)
+    
+    with col4:
+        unique_companies = fiches_df['company'].nunique()
+        st.metric("Entreprises Uniques", unique_companies)
+      # Graphiques
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Distribution des Scores de Complétude")
+        fig_hist = px.histogram(fiches_df, x='completion_score', nbins=10,
+                               title="Répartition des scores de complétude MEDDIC")
+        fig_hist.update_layout(
+            xaxis_title="Score de Complétude (%)",
+            yaxis_title="Nombre de Fiches"
+        )
+        plotly_chart(fig_hist)
+    
+    with col2:
+        st.subheader("Performance par Commercial")
+        if 'commercial' in fiches_df.columns and fiches_df['commercial'].notna().any():
+            commercial_stats = fiches_df.groupby('commercial').agg({
+                'completion_score': 'mean',
+                'id': 'count'
+            }).round(1)
+            commercial_stats.columns = ['Score Moyen', 'Nb Fiches']
+            st.dataframe(commercial_stats)
+    
+    # Évolution temporelle
+    st.subheader("Évolution dans le Temps")
+    if 'created_at' in fiches_df.columns:
+        fiches_df['created_date'] = pd.to_datetime(fiches_df['created_at']).dt.date
+        daily_counts = fiches_df.groupby('created_date').size().reset_index(name='count')
+        
+        fig_line = px.line(daily_counts, x='created_date', y='count',
+                          title="Nombre de fiches créées par jour")
+        plotly_chart(fig_line)
+    
+    # Top des entreprises
+    st.subheader("Top Entreprises")
+    top_companies = fiches_df['company'].value_counts().head(10)
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        fig_bar = px.bar(x=top_companies.index, y=top_companies.values,
+                        title="Nombre de fiches par entreprise")
+        plotly_chart(fig_bar)
+    
+    with col2:
+        st.dataframe(top_companies.reset_index())
@@ -0,0 +1,106 @@
+"""Ressources partagées par les pages : base, caches et boutons de téléchargement
+
+Les modules coûteux à importer (fpdf, fontTools) ne sont chargés qu'au
+premier téléchargement d'un PDF, pas au rendu de la page.
+"""
+from functools import partial
+
+import streamlit as st
+
+# Import des modules locaux
+from config import *
+from utils import get_fiche_pdf_filename
+from perf import timed
+from database import MEDDICDatabase
+from backup import BackupScheduler
+from export import EXPORT_FORMATS, export_fiches, get_available_formats, get_export_filename
+
+# Initialisation de la base de données (singleton : le pool de connexions est partagé entre les sessions)
+@st.cache_resource
+def init_database():
+    return MEDDICDatabase()
+
+# Planificateur de sauvegardes, démarré une seule fois par processus
+@st.cache_resource
+def init_backup_scheduler(db_path):
+    scheduler = BackupScheduler(db_path)
+    scheduler.start()
+    return scheduler
+
+# Générateur PDF (police chargée une fois) et cache disque des documents, partagés entre les sessions
+@st.cache_resource
+def init_pdf_generator():
+    from pdf_generator import MEDDICPDFGenerator
+    return MEDDICPDFGenerator()
+
+@st.cache_resource
+def init_output_cache():
+    from output_cache import OutputCache
+    return OutputCache()
+
+def _fiche_pdf_bytes(fiche_data):
+    from output_cache import get_fiche_pdf
+    return get_fiche_pdf(init_output_cache(), init_pdf_generator(), fiche_data)
+
+def _fiche_summary_bytes(fiche_data):
+    from output_cache import get_fiche_summary
+    return get_fiche_summary(init_output_cache(), fiche_data)
+
+# Cache des lectures, invalidé par la version des données (incrémentée à chaque écriture)
+
+@st.cache_data(max_entries=DATABASE_CONFIG["query_cache_entries"], show_spinner=False)
+def _cached_read(_db, db_path, data_version, method_name, *args, **kwargs):
+    return getattr(_db, method_name)(*args, **kwargs)
+
+def cached_read(db, method_name, *args, **kwargs):
+    """Appelle une méthode de lecture de MEDDICDatabase en passant par le cache versionné"""
+    return _cached_read(db, db.db_path, db.get_data_version(), method_name, *args, **kwargs)
+
+# Sérialisation et envoi des graphiques au navigateur, mesurés avec leur construction
+@timed("plotly", "st.plotly_chart")
+def plotly_chart(fig, **kwargs):
+    """Affiche un graphique plotly sur toute la largeur disponible"""
+    st.plotly_chart(fig, use_container_width=True, **kwargs)
+
+# Les boutons de téléchargement ne relancent pas l'application (on_click="ignore")
+def fiche_pdf_download_button(fiche, label="📄 PDF", key=None):
+    """Bouton de téléchargement dont le PDF n'est généré (ou lu en cache) qu'au clic"""
+    fiche_data = dict(fiche)
+    st.download_button(
+        label=label,
+        data=partial(_fiche_pdf_bytes, fiche_data),
+        file_name=get_fiche_pdf_filename(fiche_data),
+        mime="application/pdf",
+        on_click="ignore",
+        key=key
+    )
+
+def fiche_summary_download_button(fiche, label="📝 Résumé", key=None):
+    """Bouton de téléchargement du résumé Markdown d'une fiche, produit au clic"""
+    fiche_data = dict(fiche)
+    st.download_button(
+        label=label,
+        data=partial(_fiche_summary_bytes, fiche_data),
+        file_name=get_fiche_pdf_filename(fiche_data).replace('.pdf', '.md'),
+        mime="text/markdown",
+        on_click="ignore",
+        key=key
+    )
+
+def _read_export(db, export_format, filters):
+    """Contenu d'un export (download_button n'accepte pas les fichiers temporaires)"""
+    with export_fiches(db, export_format, filters) as output:
+        return output.read()
+
+def export_download_button(db, filters=None, label="📤 Export", key="export"):
+    """Choix du format et bouton de téléchargement dont l'export n'est produit qu'au clic"""
+    export_format = st.selectbox("Format", get_available_formats(), key=f"{key}_format")
+    st.download_button(
+        label=label,
+        data=partial(_read_export, db, export_format, filters),
+        file_name=get_export_filename(export_format),
+        mime=EXPORT_FORMATS[export_format][1],
+        on_click="ignore",
+        key=f"{key}_button"
+    )
+
@@ -0,0 +1,224 @@
+"""Page « Dashboard » : indicateurs clés et dernières fiches"""
+import streamlit as st
+import plotly.express
+
+# Import des modules locaux
+from config import *
+from utils import *
+from views.common import cached_read, plotly_chart
+from perf import instrumented
+
+# Construction des graphiques mesurée (panneau Performance)
+px = instrumented(plotly.express, "plotly")
+
+def show_dashboard(db):
+    """Affiche le dashboard principal amélioré"""
+    st.title("📊 Dashboard MEDDIC")
+    
+    # Récupération des données avec statistiques (sans les champs texte MEDDIC)
+    fiches_df = cached_read(db, 'get_all_fiches', include_stats=True, columns="summary")
+    
+    if fiches_df.empty:
+        st.info("🚀 Bienvenue dans MEDDIC CRM ! Commencez par créer votre première fiche.")
+        
+        # Bouton d'action rapide
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            if st.button("✏️ Créer ma première fiche MEDDIC", type="primary"):
+                st.session_state.page = "✏️ Nouvelle Fiche"
+                st.rerun()
+        return
+    
+    # Métriques principales avec design amélioré
+    st.markdown("### 📈 Métriques Clés")
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        total_fiches = len(fiches_df)
+        st.markdown("""
+        <div class="metric-container">
+            <h3 style="margin:0; color:#1f77b4;">Total Fiches</h3>
+            <h1 style="margin:0;">{}</h1>
+        </div>
+        """.format(total_fiches), unsafe_allow_html=True)
+    
+    with col2:
+        qualified = len(fiches_df[fiches_df['status'] == 'Qualifié'])
+        qualified_rate = (qualified / total_fiches * 100) if total_fiches > 0 else 0
+        color = "#32CD32" if qualified_rate > 50 else "#FFA500" if qualified_rate > 25 else "#FF6347"
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3 style="margin:0; color:{color};">Qualifiées</h3>
+            <h1 style="margin:0;">{qualified}</h1>
+            <p style="margin:0; color:gray;">{qualified_rate:.1f}%</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        in_progress = len(fiches_df[fiches_df['status'] == 'En cours'])
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3 style="margin:0; color:#FFA500;">En Cours</h3>
+            <h1 style="margin:0;">{in_progress}</h1>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        avg_completion = fiches_df['completion_score'].mean() if 'completion_score' in fiches_df.columns else 0
+        color = "#32CD32" if avg_completion > 75 else "#FFA500" if avg_completion > 50 else "#FF6347"
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3 style="margin:0; color:{color};">Complétude</h3>
+            <h1 style="margin:0;">{avg_completion:.0f}%</h1>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col5:
+        complete_fiches = len(fiches_df[fiches_df['completion_score'] == 100]) if 'completion_score' in fiches_df.columns else 0
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3 style="margin:0; color:#1f77b4;">Complètes</h3>
+            <h1 style="margin:0;">{complete_fiches}</h1>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Section graphiques
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Répartition par Statut")
+        status_counts = fiches_df['status'].value_counts()
+        colors = [get_status_color(status) for status in status_counts.index]
+        
+        fig_pie = px.pie(
+            values=status_counts.values, 
+            names=status_counts.index,
+            color_discrete_sequence=colors,
+            title="Distribution des statuts"
+        )
+        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+        plotly_chart(fig_pie)
+    
+    with col2:
+        st.subheader("🎯 Score de Complétude")
+        if 'completion_score' in fiches_df.columns:
+            fig_hist = px.histogram(
+                fiches_df, 
+                x='completion_score', 
+                nbins=10,
+                title="Distribution des scores MEDDIC",
+                color_discrete_sequence=['#1f77b4']
+            )
+            fig_hist.update_layout(
+                xaxis_title="Score de Complétude (%)",
+                yaxis_title="Nombre de Fiches"
+            )
+            plotly_chart(fig_hist)
+    
+    # Fiches prioritaires
+    st.subheader("🚨 Fiches Prioritaires")
+    priority_fiches = fiches_df[fiches_df.get('priority', 'Moyenne') == 'Haute'].head(5)
+    
+    if not priority_fiches.empty:
+        for _, fiche in priority_fiches.iterrows():
+            priority_color = get_priority_color(fiche.get('priority', 'Moyenne'))
+            status_color = get_status_color(fiche['status'])
+            completion = fiche.get('completion_score', 0)
+            
+            st.markdown(f"""
+            <div class="meddic-card priority-high">
+                <h4 style="margin-top:0;">🏢 {fiche['company']} - {fiche['client_name']}</h4>
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <div>
+                        <span class="status-badge" style="background-color: {status_color};">{fiche['status']}</span>
+                        <span style="margin-left: 10px;"><b>Commercial:</b> {fiche.get('commercial', 'N/A')}</span>
+                    </div>
+                    <div class="completion-score" style="color: {get_priority_color('Haute' if completion > 75 else 'Moyenne' if completion > 50 else 'Basse')};">
+                        {completion:.0f}% complète
+                    </div>
+                </div>
+                <p style="margin-bottom:0;"><b>Date RDV:</b> {format_date(fiche.get('meeting_date', ''))}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("Aucune fiche prioritaire détectée.")
+    
+    quick_search(db)
+    
+    # Actions rapides
+    st.markdown("---")
+    st.subheader("⚡ Actions Rapides")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if st.button("✏️ Nouvelle Fiche"):
+            st.session_state.page = "✏️ Nouvelle Fiche"
+            st.rerun()
+    
+    with col2:
+        if st.button("📋 Voir Toutes"):
+            st.session_state.page = "📋 Toutes les Fiches"
+            st.rerun()
+    
+    with col3:
+        if st.button("📈 Analytiques"):
+            st.session_state.page = "📈 Analytiques"
+            st.rerun()
+    
+    with col4:
+        if st.button("🎯 Recommandations"):
+            st.session_state.page = "🎯 Recommandations"
+            st.rerun()
+
+@st.fragment
+def quick_search(db):
+    """Recherche rapide : une recherche ne relance que ce fragment, pas les graphiques du dashboard"""
+    # Barre de recherche améliorée
+    st.subheader("🔍 Recherche Rapide")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search_term = st.text_input("Rechercher par entreprise, client, ou contenu...", placeholder="Ex: Microsoft, Jean Dupont, CRM...")
+    
+    with col2:
+        search_button = st.button("🔍 Rechercher", type="primary")
+    
+    if search_term or search_button:
+        if search_term:
+            # Recherche plein texte classée par pertinence (index FTS5)
+            filtered_df = db.search_fiches(search_term, limit=UI_CONFIG["search_results_limit"])
+            
+            if not filtered_df.empty:
+                st.success(f"✅ {len(filtered_df)} résultat(s) trouvé(s)")
+                
+                for _, fiche in filtered_df.head(5).iterrows():  # Limiter à 5 résultats
+                    completion_score = fiche['completion_score']
+                    status_color = get_status_color(fiche['status'])
+                    priority = fiche.get('priority', 'Moyenne')
+                    priority_color = get_priority_color(priority)
+                    
+                    # Recommandations rapides
+                    recommendations = generate_recommendations(fiche)
+                    
+                    st.markdown(f"""
+                    <div class="meddic-card">
+                        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
+                            <h4 style="margin:0;">{fiche['company']} - {fiche['client_name']}</h4>
+                            <div>
+                                <span class="status-badge" style="background-color: {status_color};">{fiche['status']}</span>
+                                <span class="status-badge" style="background-color: {priority_color}; margin-left: 5px;">P: {priority}</span>
+                            </div>
+                        </div>
+                        <p><b>Commercial:</b> {fiche.get('commercial', 'N/A')} | <b>Date RDV:</b> {format_date(fiche.get('meeting_date', ''))}</p>
+                        <div style="display: flex; justify-content: space-between; align-items: center;">
+                            <span><b>Complétude:</b> <span style="color: {get_priority_color('Haute' if completion_score > 75 else 'Moyenne' if completion_score > 50 else 'Basse')};">{completion_score:.0f}%</span></span>
+                            <span><b>Prochaine action:</b> {recommendations[0] if recommendations else 'Aucune recommandation'}</span>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+            else:
+                st.warning("❌ Aucun résultat trouvé pour cette recherche.")
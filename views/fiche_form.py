@@ -0,0 +1,333 @@
+"""Page « Nouvelle Fiche » : saisie et modification d'une fiche MEDDIC"""
+from datetime import datetime, date
+
+import streamlit as st
+
+# Import des modules locaux
+from config import *
+from utils import *
+from views.common import fiche_pdf_download_button
+
+def show_fiche_form(db, fiche_id=None):
+    """Affiche le formulaire de création/édition de fiche MEDDIC amélioré"""
+    if fiche_id:
+        st.title("✏️ Édition Fiche MEDDIC")
+    else:
+        st.title("✏️ Nouvelle Fiche MEDDIC")
+    
+    # Récupération des données existantes si édition
+    existing_fiche = None
+    if fiche_id:
+        existing_fiche = db.get_fiche_by_id(fiche_id)
+        if existing_fiche:
+            st.success(f"📝 Édition de la fiche: {existing_fiche['company']} - {existing_fiche['client_name']}")
+            
+            # Affichage du score actuel
+            current_score = calculate_completion_score(existing_fiche)
+            st.info(f"Score de complétude actuel: {current_score:.0f}%")
+    
+    show_saved_feedback()
+    fiche_form(db, existing_fiche)
+    
+    # Liens rapides
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("📊 Retour Dashboard"):
+            st.session_state.page = "📊 Dashboard"
+            st.rerun()
+    
+    with col2:
+        if st.button("📋 Toutes les Fiches"):
+            st.session_state.page = "📋 Toutes les Fiches"
+            st.rerun()
+    
+    with col3:
+        if existing_fiche:
+            # Le PDF n'est généré qu'au moment du téléchargement
+            fiche_pdf_download_button(existing_fiche, label="📄 Exporter PDF")
+
+def _render_fiche_form(db, existing_fiche=None):
+    """
+    Formulaire de saisie MEDDIC
+
+    Une sauvegarde ou une suppression relance toute l'application pour mettre à
+    jour les statistiques et les listes ; les autres interactions ne relancent
+    que le formulaire.
+
+    Args:
+        db (MEDDICDatabase): Base de données
+        existing_fiche (dict): Fiche éditée, None pour une création
+    """
+    with st.form("meddic_form", clear_on_submit=False):
+        # Section informations générales
+        st.markdown("### 👤 Informations Générales")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            client_name = st.text_input(
+                "Nom du client *", 
+                value=(existing_fiche['client_name'] or "") if existing_fiche else "",
+                help="Nom et prénom du contact principal"
+            )
+            company = st.text_input(
+                "Entreprise *", 
+                value=(existing_fiche['company'] or "") if existing_fiche else "",
+                help="Nom de l'entreprise cliente"
+            )
+        
+        with col2:
+            meeting_date = st.date_input(
+                "Date du rendez-vous", 
+                value=datetime.strptime(existing_fiche['meeting_date'], '%Y-%m-%d').date() 
+                if existing_fiche and existing_fiche['meeting_date'] else date.today(),
+                help="Date du rendez-vous ou de la prochaine interaction"
+            )
+            commercial = st.text_input(
+                "Commercial", 
+                value=(existing_fiche['commercial'] or "") if existing_fiche else "",
+                help="Nom du commercial en charge"
+            )
+        
+        status = st.selectbox(
+            "Statut de l'opportunité", 
+            MEDDIC_STATUS,
+            index=MEDDIC_STATUS.index(existing_fiche['status']) if existing_fiche and existing_fiche['status'] in MEDDIC_STATUS else 0,
+            help="Statut actuel de l'opportunité commerciale"
+        )
+        
+        st.markdown("---")
+        
+        # Section MEDDIC avec design amélioré
+        st.markdown("### 🎯 Analyse MEDDIC")
+        st.markdown("*Complétez chaque section pour maximiser vos chances de succès*")
+        
+        # Metrics
+        st.markdown("#### 📊 M - Metrics")
+        st.markdown("*Quels sont les KPIs quantitatifs que le client souhaite améliorer ?*")
+        metrics = st.text_area(
+            "Metrics",
+            value=(existing_fiche['metrics'] or "") if existing_fiche else "",
+            placeholder=MEDDIC_TEMPLATES['metrics']['placeholder'],
+            help=MEDDIC_TEMPLATES['metrics']['help'],
+            label_visibility="collapsed",
+            height=100
+        )
+        
+        # Economic Buyer
+        st.markdown("#### 💰 E - Economic Buyer")
+        st.markdown("*Qui a le pouvoir de décision budgétaire ?*")
+        economic_buyer = st.text_area(
+            "Economic Buyer",
+            value=(existing_fiche['economic_buyer'] or "") if existing_fiche else "",
+            placeholder=MEDDIC_TEMPLATES['economic_buyer']['placeholder'],
+            help=MEDDIC_TEMPLATES['economic_buyer']['help'],
+            label_visibility="collapsed",
+            height=100
+        )
+        
+        # Decision Criteria
+        st.markdown("#### 📋 D - Decision Criteria")
+        st.markdown("*Quels sont les critères de décision principaux ?*")
+        decision_criteria = st.text_area(
+            "Decision Criteria",
+            value=(existing_fiche['decision_criteria'] or "") if existing_fiche else "",
+            placeholder=MEDDIC_TEMPLATES['decision_criteria']['placeholder'],
+            help=MEDDIC_TEMPLATES['decision_criteria']['help'],
+            label_visibility="collapsed",
+            height=100
+        )
+        
+        # Decision Process
+        st.markdown("#### ⚙️ D - Decision Process")
+        st.markdown("*Quel est le processus de décision ? Qui est impliqué ?*")
+        decision_process = st.text_area(
+            "Decision Process",
+            value=(existing_fiche['decision_process'] or "") if existing_fiche else "",
+            placeholder=MEDDIC_TEMPLATES['decision_process']['placeholder'],
+            help=MEDDIC_TEMPLATES['decision_process']['help'],
+            label_visibility="collapsed",
+            height=100
+        )
+        
+        # Identify Pain
+        st.markdown("#### 🎯 I - Identify Pain")
+        st.markdown("*Quelles sont les douleurs/problèmes identifiés ?*")
+        identify_pain = st.text_area(
+            "Identify Pain",
+            value=(existing_fiche['identify_pain'] or "") if existing_fiche else "",
+            placeholder=MEDDIC_TEMPLATES['identify_pain']['placeholder'],
+            help=MEDDIC_TEMPLATES['identify_pain']['help'],
+            label_visibility="collapsed",
+            height=100
+        )
+        
+        # Champion
+        st.markdown("#### 🤝 C - Champion")
+        st.markdown("*Qui est votre champion interne ? Pourquoi vous soutient-il ?*")
+        champion = st.text_area(
+            "Champion",
+            value=(existing_fiche['champion'] or "") if existing_fiche else "",
+            placeholder=MEDDIC_TEMPLATES['champion']['placeholder'],
+            help=MEDDIC_TEMPLATES['champion']['help'],
+            label_visibility="collapsed",
+            height=100
+        )
+        
+        # Notes additionnelles
+        st.markdown("---")
+        st.markdown("#### 📝 Notes Additionnelles")
+        notes = st.text_area(
+            "Notes libres",
+            value=(existing_fiche['notes'] or "") if existing_fiche else "",
+            placeholder="Observations, prochaines étapes, remarques, concurrents, objections...",
+            help="Toute information complémentaire utile pour le suivi",
+            height=120
+        )
+        
+        # Calcul du score en temps réel (simulation)
+        temp_fiche = {
+            'metrics': metrics,
+            'economic_buyer': economic_buyer,
+            'decision_criteria': decision_criteria,
+            'decision_process': decision_process,
+            'identify_pain': identify_pain,
+            'champion': champion
+        }
+        current_completion = calculate_completion_score(temp_fiche)
+        
+        # Affichage du score
+        score_color = "#32CD32" if current_completion > 75 else "#FFA500" if current_completion > 50 else "#FF6347"
+        st.markdown(f"""
+        <div style="background-color: {score_color}20; border: 2px solid {score_color}; border-radius: 10px; padding: 15px; margin: 20px 0;">
+            <h3 style="margin: 0; color: {score_color};">Score de Complétude: {current_completion:.0f}%</h3>
+            <p style="margin: 5px 0 0 0; color: #666;">
+                {6 - int(current_completion / 100 * 6)} champ(s) MEDDIC restant(s) à compléter
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Boutons de soumission
+        st.markdown("---")
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
+        
+        with col2:
+            submitted = st.form_submit_button("💾 Sauvegarder", type="primary", use_container_width=True)
+        
+        with col3:
+            if existing_fiche:
+                delete_clicked = st.form_submit_button("🗑️ Supprimer", type="secondary", use_container_width=True)
+                
+                if delete_clicked:
+                    # Confirmation de suppression
+                    if st.session_state.get('confirm_delete') != existing_fiche['id']:
+                        st.session_state.confirm_delete = existing_fiche['id']
+                        st.warning("⚠️ Cliquez à nouveau pour confirmer la suppression")
+                    else:
+                        db.delete_fiche(existing_fiche['id'])
+                        st.success("✅ Fiche supprimée avec succès !")
+                        del st.session_state.confirm_delete
+                        st.session_state.page = "📋 Toutes les Fiches"
+                        st.rerun()
+        
+        # Traitement de la soumission
+        if submitted:
+            # Validation des champs obligatoires
+            if not client_name or not company:
+                st.error("❌ Les champs 'Nom du client' et 'Entreprise' sont obligatoires.")
+            else:
+                # Préparation des données
+                fiche_data = {
+                    'client_name': client_name.strip(),
+                    'company': company.strip(),
+                    'meeting_date': meeting_date.strftime('%Y-%m-%d'),
+                    'commercial': commercial.strip(),
+                    'metrics': metrics.strip(),
+                    'economic_buyer': economic_buyer.strip(),
+                    'decision_criteria': decision_criteria.strip(),
+                    'decision_process': decision_process.strip(),
+                    'identify_pain': identify_pain.strip(),
+                    'champion': champion.strip(),
+                    'status': status,
+                    'notes': notes.strip()
+                }
+                
+                if existing_fiche:
+                    fiche_data['id'] = existing_fiche['id']
+                
+                try:
+                    # Sauvegarde
+                    db.save_fiche(fiche_data)
+                except Exception as e:
+                    st.error(f"❌ Erreur lors de la sauvegarde: {str(e)}")
+                else:
+                    st.session_state.saved_fiche = fiche_data
+                    st.rerun()
+        
+        # Aide contextuelle
+        with st.expander("💡 Aide pour remplir MEDDIC"):
+            st.markdown("""
+            ### Guide de Qualification MEDDIC
+            
+            **📊 Metrics:** Soyez spécifique avec des chiffres
+            - ❌ "Améliorer l'efficacité"
+            - ✅ "Réduire le temps de traitement de 30%, économiser 50k€/an"
+            
+            **💰 Economic Buyer:** Identifiez le vrai décideur
+            - ❌ "Le responsable IT"
+            - ✅ "Jean Dupont, CFO, décision finale sur budgets >100k€"
+            
+            **📋 Decision Criteria:** Listez TOUS les critères
+            - Prix, fonctionnalités, support, références, délais...
+            
+            **⚙️ Decision Process:** Cartographiez le processus
+            - Qui, quand, comment, étapes, comités, validations...
+            
+            **🎯 Identify Pain:** Quantifiez l'impact
+            - Coût du problème, urgence, conséquences de l'inaction...
+            
+            **🤝 Champion:** Trouvez votre allié
+            - Qui vous soutient activement et pourquoi ?
+            """)
+
+# Le formulaire est un fragment : taper dans les champs ou afficher l'aide ne
+# relance pas le reste de la page
+fiche_form = st.fragment(_render_fiche_form)
+
+@st.dialog("✏️ Édition Fiche MEDDIC", width="large")
+def edit_fiche_dialog(db, fiche_id):
+    """Édition d'une fiche dans une fenêtre modale, sans quitter la page courante"""
+    existing_fiche = db.get_fiche_by_id(fiche_id)
+    if existing_fiche is None:
+        st.error("❌ Cette fiche n'existe plus.")
+        return
+    st.caption(f"📝 {existing_fiche['company']} - {existing_fiche['client_name']}")
+    _render_fiche_form(db, existing_fiche)
+
+def show_saved_feedback():
+    """Affiche le bilan de la dernière fiche sauvegardée (après le rechargement de l'application)"""
+    fiche_data = st.session_state.pop('saved_fiche', None)
+    if fiche_data is None:
+        return
+    
+    st.success("✅ Fiche sauvegardée avec succès !")
+    
+    final_score = calculate_completion_score(fiche_data)
+    
+    if final_score == 100:
+        st.balloons()
+        st.success("🎉 Excellente qualification MEDDIC complète ! Votre opportunité est prête pour la suite du processus.")
+    elif final_score >= 75:
+        st.info("👍 Bonne qualification ! Quelques détails supplémentaires permettraient d'optimiser votre approche.")
+    elif final_score >= 50:
+        st.warning("⚠️ Qualification partielle. Complétez les champs manquants pour améliorer vos chances de succès.")
+    else:
+        st.error("🔴 Qualification insuffisante. Il est recommandé de compléter davantage d'informations MEDDIC.")
+    
+    # Génération de recommandations
+    recommendations = generate_recommendations(fiche_data)
+    if recommendations:
+        st.markdown("### 🎯 Recommandations")
+        for i, rec in enumerate(recommendations[:3], 1):
+            st.markdown(f"{i}. {rec}")
@@ -0,0 +1,146 @@
+"""Page « Toutes les Fiches » : liste filtrée et paginée, export de la sélection"""
+import streamlit as st
+
+# Import des modules locaux
+from config import *
+from utils import *
+from views.common import (
+    cached_read, fiche_pdf_download_button, fiche_summary_download_button, export_download_button
+)
+from views.fiche_form import edit_fiche_dialog, show_saved_feedback
+
+def show_all_fiches(db):
+    """Affiche toutes les fiches avec options de filtrage"""
+    st.title("📋 Toutes les Fiches MEDDIC")
+    
+    # Les fiches sans statut comptent : le test ne dépend pas des valeurs de filtre
+    if not cached_read(db, 'has_fiches'):
+        st.info("Aucune fiche créée.")
+        return
+    
+    # Valeurs des filtres issues de SELECT DISTINCT sur les colonnes indexées
+    status_values = cached_read(db, 'get_distinct_values', 'status')
+    
+    show_saved_feedback()
+    fiche_browser(db, status_values)
+
+@st.fragment
+def fiche_browser(db, status_values):
+    """
+    Filtres, liste paginée et export de la sélection
+
+    Changer un filtre ou de page ne relance que ce fragment : la sidebar et le
+    reste de l'application ne sont pas recalculés.
+
+    Args:
+        db (MEDDICDatabase): Base de données
+        status_values (list): Statuts présents en base
+    """
+    # Filtres
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        status_filter = st.selectbox("Filtrer par statut", 
+                                   ["Tous"] + status_values)
+    
+    with col2:
+        company_filter = st.selectbox("Filtrer par entreprise", 
+                                    ["Toutes"] + cached_read(db, 'get_distinct_values', 'company'))
+    
+    with col3:
+        commercial_filter = st.selectbox("Filtrer par commercial", 
+                                       ["Tous"] + cached_read(db, 'get_distinct_values', 'commercial'))
+    
+    filters = {
+        'status': None if status_filter == "Tous" else status_filter,
+        'company': None if company_filter == "Toutes" else company_filter,
+        'commercial': None if commercial_filter == "Tous" else commercial_filter
+    }
+    
+    # Retour à la première page lorsque les filtres changent
+    if st.session_state.get('fiches_filters') != filters:
+        st.session_state.fiches_filters = filters
+        st.session_state.fiches_page = 1
+    
+    page_size = UI_CONFIG["fiches_per_page"]
+    filtered_df, total = cached_read(db, 'query_fiches', filters, page=st.session_state.get('fiches_page', 1), page_size=page_size)
+    page_count = max((total + page_size - 1) // page_size, 1)
+    
+    # La page courante peut ne plus exister après une suppression
+    if st.session_state.get('fiches_page', 1) > page_count:
+        st.session_state.fiches_page = page_count
+        filtered_df, total = cached_read(db, 'query_fiches', filters, page=page_count, page_size=page_size)
+    
+    st.write(f"**{total}** fiche(s) trouvée(s)")
+    
+    # Export des fiches correspondant aux filtres courants
+    if total:
+        with st.expander("📤 Exporter la sélection"):
+            export_download_button(db, filters, label="Télécharger", key="filtered_export")
+    
+    # Affichage des fiches
+    for _, fiche in filtered_df.iterrows():
+        fiche_card(db, fiche)
+    
+    # Pagination
+    if page_count > 1:
+        st.number_input(
+            f"Page (sur {page_count})",
+            min_value=1,
+            max_value=page_count,
+            step=1,
+            key="fiches_page"
+        )
+
+@st.fragment
+def fiche_card(db, fiche):
+    """
+    Carte d'une fiche : ses boutons ne relancent que la carte
+
+    L'édition s'ouvre dans une fenêtre modale ; une suppression confirmée
+    relance toute l'application (liste et statistiques changent).
+    """
+    completion_score = fiche['completion_score']
+    status_color = get_status_color(fiche['status'])
+    
+    with st.expander(f"🏢 {fiche['company']} - {fiche['client_name']} ({completion_score:.0f}% complète)"):
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.write(f"**Commercial:** {fiche['commercial']}")
+            st.write(f"**Date RDV:** {fiche['meeting_date']}")
+            st.write(f"**Statut:** {fiche['status']}")
+            
+            if is_filled(fiche['metrics']):
+                st.markdown("**📊 Metrics:**")
+                st.write(fiche['metrics'][:200] + "..." if len(fiche['metrics']) > 200 else fiche['metrics'])
+            
+            if is_filled(fiche['identify_pain']):
+                st.markdown("**🎯 Pain Points:**")
+                st.write(fiche['identify_pain'][:200] + "..." if len(fiche['identify_pain']) > 200 else fiche['identify_pain'])
+        with col2:
+            # Boutons d'action
+            btn_col1, btn_col2 = st.columns(2)
+            
+            with btn_col1:
+                if st.button(f"✏️ Éditer", key=f"edit_{fiche['id']}"):
+                    edit_fiche_dialog(db, int(fiche['id']))
+            
+            with btn_col2:
+                # Bouton de suppression avec confirmation
+                delete_key = f"delete_{fiche['id']}"
+                confirm_key = f"confirm_delete_{fiche['id']}"
+                
+                if st.button(f"🗑️ Supprimer", key=delete_key, type="secondary"):
+                    if st.session_state.get(confirm_key):
+                        db.delete_fiche(fiche['id'])
+                        st.success(f"✅ Fiche '{fiche['company']}' supprimée avec succès !")
+                        st.session_state[confirm_key] = False
+                        st.rerun()
+                    else:
+                        st.session_state[confirm_key] = True
+                        st.warning("⚠️ Cliquez à nouveau pour confirmer la suppression")
+            
+            # Génération PDF différée : rien n'est rendu tant que l'utilisateur ne clique pas
+            fiche_pdf_download_button(fiche, key=f"pdf_{fiche['id']}")
+            fiche_summary_download_button(fiche, key=f"md_{fiche['id']}")
@@ -0,0 +1,98 @@
+"""Panneau « Performance » de la sidebar : spans de l'exécution courante et totaux par page"""
+import pandas as pd
+import streamlit as st
+
+# Import des modules locaux
+from config import *
+import perf
+import query_log
+
+def _request_profile():
+    st.session_state.perf_profile_next = True
+
+def _reset():
+    perf.reset()
+    query_log.reset()
+
+def _dump_metrics():
+    try:
+        perf.dump(PERF_CONFIG["dump_path"])
+        st.session_state.perf_dump_message = f"Mesures écrites dans {PERF_CONFIG['dump_path']}"
+    except OSError as e:
+        st.session_state.perf_dump_message = f"Erreur d'écriture: {str(e)}"
+
+def show_performance_panel(rerun):
+    """
+    Affiche les mesures de l'exécution terminée et les totaux cumulés
+
+    Args:
+        rerun (perf.Rerun): Exécution qui vient de se terminer
+    """
+    with st.expander("⏱️ Performance"):
+        st.metric("Dernière exécution", f"{rerun.elapsed() * 1000:.0f} ms")
+        categories = sorted(rerun.by_category().items(), key=lambda item: item[1], reverse=True)
+        if categories:
+            st.caption(" · ".join(f"{category}: {duration * 1000:.1f} ms" for category, duration in categories))
+
+        spans = sorted(rerun.spans.items(), key=lambda item: item[1][1], reverse=True)[:PERF_CONFIG["top_spans"]]
+        if spans:
+            st.dataframe(pd.DataFrame([
+                {"Span": name, "Appels": count, "ms": round(total * 1000, 1)}
+                for name, (count, total, _) in spans
+            ]), hide_index=True)
+
+        page_totals = perf.get_page_totals()
+        if page_totals:
+            st.markdown("**Par page**")
+            st.dataframe(pd.DataFrame(page_totals).rename(columns={
+                "page": "Page", "reruns": "Exécutions", "avg_ms": "ms moy.", "max_ms": "ms max"
+            }), hide_index=True)
+
+            st.markdown("**Spans cumulés**")
+            st.dataframe(pd.DataFrame(perf.get_span_totals()[:PERF_CONFIG["top_spans"]]).rename(columns={
+                "page": "Page", "span": "Span", "category": "Catégorie", "count": "Appels",
+                "total_ms": "ms total", "max_ms": "ms max"
+            }), hide_index=True)
+
+        # Requêtes normalisées, y compris celles servies aux autres sessions et à l'API
+        statements = query_log.get_top_statements(PERF_CONFIG["top_statements"])
+        if statements:
+            st.markdown("**Requêtes SQL (temps cumulé)**")
+            st.dataframe(pd.DataFrame(statements).rename(columns={
+                "sql": "Requête", "count": "Exécutions", "total_ms": "ms total", "avg_ms": "ms moy.",
+                "max_ms": "ms max", "rows": "Lignes"
+            }), hide_index=True)
+
+        elif not DATABASE_CONFIG["query_log"]:
+            st.caption("Statistiques SQL désactivées (MEDDIC_QUERY_LOG=1 pour les activer)")
+
+        slow_queries = query_log.get_slow_queries()
+        if slow_queries:
+            st.markdown(f"**Requêtes lentes (≥ {DATABASE_CONFIG['slow_query_ms']} ms)**")
+            for query in slow_queries[:PERF_CONFIG["top_statements"]]:
+                st.caption(f"{query['at']} · {query['duration_ms']:.1f} ms · {query['rows']} ligne(s)")
+                st.code(f"{query['sql']}\n\n{query['plan'] or ''}".strip(), language="sql")
+
+        # Exports produits au clic, sans relancer l'application
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSON", data=perf.to_json, file_name="meddic_perf.json",
+                               mime="application/json", on_click="ignore", key="perf_json")
+        with col2:
+            st.download_button("Prometheus", data=perf.to_prometheus, file_name="meddic_perf.prom",
+                               mime="text/plain", on_click="ignore", key="perf_prometheus")
+
+        st.button("💾 Écrire le fichier de mesures", on_click=_dump_metrics, key="perf_dump")
+        if 'perf_dump_message' in st.session_state:
+            st.caption(st.session_state.pop('perf_dump_message'))
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button("🔬 Profiler", on_click=_request_profile, key="perf_profile_button",
+                      help="Capture un profil cProfile de la prochaine exécution")
+        with col2:
+            st.button("🗑️ Réinitialiser", on_click=_reset, key="perf_reset")
+
+        if st.session_state.get('perf_profile'):
+            st.caption(f"Profil cProfile ({st.session_state.get('perf_profile_page')})")
+            st.code(st.session_state.perf_profile, language=None)
@@ -0,0 +1,305 @@
+"""Page « Recommandations » : priorités d'action et corrélations MEDDIC"""
+import pandas as pd
+import plotly.express
+import streamlit as st
+
+# Import des modules locaux
+from config import *
+from utils import *
+from views.common import cached_read, plotly_chart
+from perf import instrumented
+
+# Construction des graphiques mesurée (panneau Performance)
+px = instrumented(plotly.express, "plotly")
+from views.fiche_form import edit_fiche_dialog, show_saved_feedback
+
+def show_recommendations_page(db):
+    """Affiche la page des recommandations intelligentes"""
+    st.title("🎯 Recommandations MEDDIC")
+    
+    show_saved_feedback()
+    
+    fiches_df = cached_read(db, 'get_all_fiches', include_stats=True)
+    
+    if fiches_df.empty:
+        st.info("Aucune fiche disponible pour générer des recommandations.")
+        if st.button("✏️ Créer ma première fiche"):
+            st.session_state.page = "✏️ Nouvelle Fiche"
+            st.rerun()
+        return
+    
+    # Priorité recalculée à la date du jour (le score de complétude est persisté)
+    fiches_df['priority'] = get_priority_levels(fiches_df)
+    
+    # Métriques globales des recommandations
+    st.markdown("### 📊 Vue d'Ensemble des Recommandations")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Fiches à Compléter", len(fiches_df[fiches_df['completion_score'] < 100]), 
+                 delta=f"-{100-fiches_df['completion_score'].mean():.0f}% à combler")
+    
+    with col2:
+        st.metric("Priorité Haute", len(fiches_df[fiches_df['priority'] == 'Haute']),
+                 delta="Attention requise" if len(fiches_df[fiches_df['priority'] == 'Haute']) > 0 else "Aucune urgence")
+    
+    with col3:
+        st.metric("Fiches Stagnantes", len(fiches_df[fiches_df['status'] == 'En attente']),
+                 delta="À relancer" if len(fiches_df[fiches_df['status'] == 'En attente']) > 0 else "Toutes actives")
+    
+    with col4:
+        st.metric("Prêtes à Qualifier", len(fiches_df[(fiches_df['completion_score'] >= 80) & (fiches_df['status'] == 'En cours')]),
+                 delta="Proposer démo" if len(fiches_df[(fiches_df['completion_score'] >= 80) & (fiches_df['status'] == 'En cours')]) > 0 else "Continuer qualification")
+    
+    st.markdown("---")
+    
+    # Recommandations par catégorie
+    tab1, tab2, tab3, tab4 = st.tabs(["🔴 Actions Urgentes", "📈 Optimisations", "💡 Conseils", "📊 Analyses"])
+    
+    with tab1:
+        st.markdown("### 🔴 Actions Urgentes à Réaliser")
+        
+        urgent_actions = []
+        
+        # Fiches incomplètes avec haute priorité
+        urgent_incomplete = fiches_df[
+            (fiches_df['completion_score'] < 50) & 
+            (fiches_df['priority'] == 'Haute')
+        ]
+        
+        for _, fiche in urgent_incomplete.iterrows():
+            recommendations = generate_recommendations(fiche)
+            urgent_actions.extend([{
+                'fiche': fiche,
+                'type': 'Qualification Urgente',
+                'action': rec,
+                'priority': 'Critique'
+            } for rec in recommendations[:2]])
+        
+        # Fiches stagnantes
+        stagnant = fiches_df[fiches_df['status'] == 'En attente']
+        for _, fiche in stagnant.iterrows():
+            urgent_actions.append({
+                'fiche': fiche,
+                'type': 'Relance Client',
+                'action': f"⏰ Relancer {fiche['company']} - {fiche['client_name']} (en attente depuis le {format_date(fiche.get('updated_at', ''))})",
+                'priority': 'Haute'
+            })
+        
+        # Fiches prêtes à qualifier
+        ready_to_qualify = fiches_df[
+            (fiches_df['completion_score'] >= 80) & 
+            (fiches_df['status'] == 'En cours')
+        ]
+        
+        for _, fiche in ready_to_qualify.iterrows():
+            urgent_actions.append({
+                'fiche': fiche,
+                'type': 'Progression',
+                'action': f"✅ Proposer une démonstration à {fiche['company']} (qualification à {fiche['completion_score']:.0f}%)",
+                'priority': 'Moyenne'
+            })
+        
+        if urgent_actions:
+            for i, action in enumerate(urgent_actions[:10], 1):  # Limiter à 10 actions urgentes
+                priority_color = "#FF4B4B" if action['priority'] == 'Critique' else "#FFA500"
+                
+                st.markdown(f"""
+                <div class="meddic-card" style="border-left-color: {priority_color};">
+                    <h4 style="margin-top: 0; color: {priority_color};">{i}. {action['type']} - {action['fiche']['company']}</h4>
+                    <p style="margin-bottom: 5px;">{action['action']}</p>
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <span><strong>Commercial:</strong> {action['fiche'].get('commercial', 'N/A')}</span>
+                        <span class="status-badge" style="background-color: {priority_color};">{action['priority']}</span>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                # Bouton d'action rapide
+                if st.button(f"✏️ Modifier cette fiche", key=f"urgent_{action['fiche']['id']}"):
+                    edit_fiche_dialog(db, int(action['fiche']['id']))
+        else:
+            st.success("🎉 Aucune action urgente ! Votre pipeline MEDDIC est bien géré.")
+    
+    with tab2:
+        st.markdown("### 📈 Optimisations Recommandées")
+        
+        # Analyse des champs MEDDIC les moins remplis
+        meddic_fields = ['metrics', 'economic_buyer', 'decision_criteria', 'decision_process', 'identify_pain', 'champion']
+        field_completion = {}
+        
+        for field in meddic_fields:
+            filled_count = int(fiches_df[f"{field}_filled"].sum())
+            field_completion[field] = (filled_count / len(fiches_df)) * 100
+        
+        st.markdown("#### 📊 Complétude par Champ MEDDIC")
+        
+        # Graphique des champs les moins remplis
+        field_df = pd.DataFrame([
+            {'Champ': k.replace('_', ' ').title(), 'Complétude (%)': v}
+            for k, v in field_completion.items()
+        ])
+        
+        fig_fields = px.bar(field_df, x='Champ', y='Complétude (%)',
+                           title="Complétude par critère MEDDIC",
+                           color='Complétude (%)',
+                           color_continuous_scale=['red', 'orange', 'green'])
+        fig_fields.update_layout(showlegend=False)
+        plotly_chart(fig_fields)
+        
+        # Recommandations d'amélioration
+        worst_fields = sorted(field_completion.items(), key=lambda x: x[1])[:3]
+        
+        st.markdown("#### 💡 Points d'Amélioration Prioritaires")
+        for field, completion in worst_fields:
+            field_name = field.replace('_', ' ').title()
+            st.markdown(f"""
+            **{field_name}** - {completion:.0f}% de complétude
+            - Focus formation équipe commerciale sur ce critère
+            - Intégrer des questions spécifiques dans les call scripts
+            - Prévoir des templates et exemples
+            """)
+        
+        # Analyse par commercial
+        if 'commercial' in fiches_df.columns and fiches_df['commercial'].notna().any():
+            st.markdown("#### 👥 Performance par Commercial")
+            
+            commercial_performance = fiches_df.groupby('commercial').agg({
+                'completion_score': ['mean', 'count'],
+                'status': lambda x: (x == 'Qualifié').sum()
+            }).round(1)
+            
+            commercial_performance.columns = ['Score Moyen', 'Nb Fiches', 'Nb Qualifiées']
+            commercial_performance['Taux Qualification'] = (
+                commercial_performance['Nb Qualifiées'] / commercial_performance['Nb Fiches'] * 100
+            ).round(1)
+            
+            st.dataframe(commercial_performance)
+            
+            # Recommandations par commercial
+            low_performers = commercial_performance[commercial_performance['Score Moyen'] < 60]
+            if not low_performers.empty:
+                st.warning("⚠️ Commerciaux nécessitant un accompagnement MEDDIC:")
+                for commercial in low_performers.index:
+                    score = low_performers.loc[commercial, 'Score Moyen']
+                    st.markdown(f"- **{commercial}**: Score moyen {score}% - Formation recommandée")
+    
+    with tab3:
+        st.markdown("### 💡 Conseils et Bonnes Pratiques")
+        
+        # Conseils basés sur les données
+        total_fiches = len(fiches_df)
+        avg_completion = fiches_df['completion_score'].mean()
+        qualified_rate = (len(fiches_df[fiches_df['status'] == 'Qualifié']) / total_fiches) * 100
+        
+        st.markdown("#### 🎯 Conseils Personnalisés")
+        
+        if avg_completion < 60:
+            st.markdown("""
+            **🔴 Amélioration Urgente de la Qualification**
+            - Votre score de complétude moyen est faible ({:.0f}%)
+            - Organisez une formation MEDDIC pour l'équipe
+            - Utilisez des check-lists pour chaque rendez-vous
+            - Planifiez des suivis systématiques post-RDV
+            """.format(avg_completion))
+        
+        elif avg_completion < 80:
+            st.markdown("""
+            **🟡 Bonne Base, Optimisation Possible**
+            - Score correct ({:.0f}%) mais perfectible
+            - Focalisez sur les champs les moins remplis
+            - Développez des templates de questions
+            - Partagez les bonnes pratiques entre commerciaux
+            """.format(avg_completion))
+        
+        else:
+            st.markdown("""
+            **🟢 Excellente Qualification MEDDIC**
+            - Score excellent ({:.0f}%) - Continuez ainsi !
+            - Partagez vos méthodes avec d'autres équipes
+            - Focus sur l'accélération du cycle de vente
+            - Développez des cas d'usage avancés
+            """.format(avg_completion))
+        
+        # Conseils génériques
+        st.markdown("#### 📚 Bonnes Pratiques MEDDIC")
+        
+        tips = [
+            "🎯 **Metrics**: Toujours quantifier l'impact business (€, %, temps)",
+            "💰 **Economic Buyer**: Valider le budget ET le pouvoir de décision",
+            "📋 **Decision Criteria**: Lister TOUS les critères, même les non-dits",
+            "⚙️ **Decision Process**: Cartographier qui fait quoi, quand",
+            "🔍 **Identify Pain**: Quantifier le coût de l'inaction",
+            "🤝 **Champion**: Développer plusieurs champions pour réduire les risques"
+        ]
+        
+        for tip in tips:
+            st.markdown(tip)
+        
+        # Ressources utiles
+        with st.expander("📖 Ressources et Templates"):
+            st.markdown("""
+            #### Questions Types par Critère MEDDIC
+            
+            **Metrics:**
+            - Quels sont vos objectifs chiffrés pour cette année ?
+            - Comment mesurez-vous le succès de ce projet ?
+            - Quel ROI attendez-vous ?
+            
+            **Economic Buyer:**
+            - Qui valide les investissements de cette ampleur ?
+            - Quel est le processus de validation budgétaire ?
+            - Qui signe le bon de commande final ?
+            
+            **Decision Criteria:**
+            - Quels sont vos critères de choix prioritaires ?
+            - Qu'est-ce qui vous ferait dire NON à une solution ?
+            - Y a-t-il des critères non-négociables ?
+            
+            **Decision Process:**
+            - Qui d'autre est impliqué dans cette décision ?
+            - Quelles sont les étapes de votre processus ?
+            - Quel est votre timeline de décision ?
+            
+            **Identify Pain:**
+            - Quel est l'impact de ce problème sur votre business ?
+            - Que se passe-t-il si vous ne faites rien ?
+            - Combien cela vous coûte actuellement ?
+            
+            **Champion:**
+            - Qui bénéficierait le plus de cette solution ?
+            - Qui pourrait nous soutenir en interne ?
+            - Qui d'autre partage cette vision ?
+            """)
+    
+    with tab4:
+        st.markdown("### 📊 Analyses Détaillées")
+        
+        # Analyse de corrélation
+        st.markdown("#### 🔗 Analyse de Corrélation")
+          # Matrice de corrélation entre complétude et succès
+        success_analysis = []
+        
+        for _, fiche in fiches_df.iterrows():
+            success_analysis.append({
+                'completion_score': fiche['completion_score'],
+                'is_qualified': 1 if fiche['status'] == 'Qualifié' else 0,
+                'is_won': 1 if fiche['status'] == 'Fermé - Gagné' else 0,
+                'priority_score': 3 if fiche.get('priority') == 'Haute' else 2 if fiche.get('priority') == 'Moyenne' else 1
+            })
+        
+        analysis_df = pd.DataFrame(success_analysis)
+        
+        if len(analysis_df) > 5:  # Suffisamment de données
+            correlation = analysis_df['completion_score'].corr(analysis_df['is_qualified'])
+            
+            st.metric("Corrélation Complétude ↔ Qualification", f"{correlation:.2f}",
+                     help="Plus proche de 1 = forte corrélation positive")
+            
+            if correlation > 0.6:
+                st.success("🎉 Forte corrélation : Une meilleure qualification MEDDIC améliore vos résultats !")
+            elif correlation > 0.3:
+                st.info("👍 Corrélation modérée : MEDDIC a un impact positif sur vos qualifications.")
+            else:
+                st.warning("⚠️ Corrélation faible : Analysez d'autres facteurs de succès.")